@@ -1,144 +1,676 @@
+import asyncio
 import os
 import json
+import random
 import re
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+import sys
+import functools
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from google.auth.exceptions import GoogleAuthError
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
-from typing import Optional, List, Dict, Any, Annotated
-
-# Load .env file automatically from the same directory as this script
+from typing import Optional, List, Dict, Any, Annotated, Tuple, TYPE_CHECKING
+
+try:
+    import orjson  # Optional: faster decoding of API responses
+except ImportError:
+    orjson = None
+
+# The Google auth/discovery clients are imported on first use (see
+# get_credentials and the service getters) so the server starts quickly
+# even in sessions that never call a Google API.
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    import google_auth_httplib2
+
+# Load .env file automatically from the same directory as this script.
+# _ENV_LOADED records that the file has been read so get_env never re-parses it.
 script_dir = os.path.dirname(os.path.abspath(__file__))
 env_path = os.path.join(script_dir, '.env')
-if os.path.exists(env_path):
+_ENV_LOADED = False
+if os.getenv("GOOGLE_TOKEN_PATH") and os.getenv("GOOGLE_CREDENTIALS_PATH"):
+    pass  # Already configured by the environment
+elif os.path.exists(env_path):
     load_dotenv(env_path)
+    _ENV_LOADED = True
     print(f"Loaded environment variables from: {env_path}")
 else:
     print(f"Warning: .env file not found at: {env_path}")
 
-def get_env(var: str) -> str:
-    """Fetch environment variable or raise error if missing."""
+class GoogleDocsError(RuntimeError):
+    """A failure a tool reports to the client: API or network errors, bad configuration."""
+
+def get_optional_env(var: str) -> Optional[str]:
+    """Fetch environment variable, falling back to the .env file; None if unset."""
+    global _ENV_LOADED
     value = os.getenv(var)
-    if not value:
-        # Try to load from .env file in script directory if not found
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        env_path = os.path.join(script_dir, '.env')
+    if not value and not _ENV_LOADED:
+        # Try to load from .env file in script directory if not found. Only
+        # fill in what's missing: values from the process environment win
+        _ENV_LOADED = True
         if os.path.exists(env_path):
-            load_dotenv(env_path, override=True)
+            load_dotenv(env_path, override=False)
             value = os.getenv(var)
-        if not value:
-            raise RuntimeError(f"Missing required environment variable: {var}")
+    return value or None
+
+def get_env(var: str) -> str:
+    """Fetch environment variable or raise error if missing."""
+    value = get_optional_env(var)
+    if not value:
+        raise GoogleDocsError(f"Missing required environment variable: {var}")
     return value
 
-def get_credentials() -> Credentials:
-    """Get Google Docs API credentials."""
-    creds = None
-    token_path = get_env("GOOGLE_TOKEN_PATH")
-    credentials_path = get_env("GOOGLE_CREDENTIALS_PATH")
-    
-    # Make paths relative to script directory if they're not absolute
-    if not os.path.isabs(token_path):
-        token_path = os.path.join(script_dir, token_path)
-    if not os.path.isabs(credentials_path):
-        credentials_path = os.path.join(script_dir, credentials_path)
-    
-    # Debug: Check if files exist
-    if not os.path.exists(credentials_path):
-        raise RuntimeError(f"Credentials file not found: {credentials_path}")
-    if not os.path.exists(token_path):
-        print(f"Token file not found: {token_path} (will be created on first auth)")
-    
-    # Load existing token if available
-    if os.path.exists(token_path) and os.path.getsize(token_path) > 0:
+# Credentials and built services are cached for the life of the process so that
+# tool calls don't re-read the token file or rebuild the discovery-backed client.
+# httplib2.Http is not thread-safe, so the authorized Http (and the services
+# bound to it) are kept per thread; each one holds its keep-alive connections.
+# There is deliberately no httplib2 response cache: its FileCache isn't safe to
+# share between threads, and it would store document contents on disk.
+_creds: Optional["Credentials"] = None
+_creds_lock = threading.Lock()
+_local = threading.local()
+# Reconnect periodically rather than holding sockets open indefinitely; idle
+# keep-alive connections are eventually dropped by Google's front ends.
+HTTP_MAX_AGE_SECONDS = 600.0
+
+def _save_token(creds: "Credentials", token_path: str) -> None:
+    """Persist credentials so the next run can reuse them."""
+    with open(token_path, 'w') as token:
+        token.write(creds.to_json())
+
+def get_credentials() -> "Credentials":
+    """Get Google Docs API credentials.
+
+    Returns the cached credentials when still valid, refreshing them in place
+    when the access token has expired.
+    """
+    global _creds
+    creds = _creds
+    if creds is not None and creds.valid:
+        # Fast path: no lock while the shared token is still good
+        return creds
+
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+
+    with _creds_lock:
+        if _creds is not None and _creds.valid:
+            return _creds
+
+        token_path = get_env("GOOGLE_TOKEN_PATH")
+        credentials_path = get_env("GOOGLE_CREDENTIALS_PATH")
+
+        # Make paths relative to script directory if they're not absolute
+        if not os.path.isabs(token_path):
+            token_path = os.path.join(script_dir, token_path)
+        if not os.path.isabs(credentials_path):
+            credentials_path = os.path.join(script_dir, credentials_path)
+
+        if _creds is not None and _creds.expired and _creds.refresh_token:
+            _creds.refresh(Request())
+            _save_token(_creds, token_path)
+            return _creds
+
+        creds = None
+
+        # Debug: Check if files exist (one stat per file)
         try:
-            creds = Credentials.from_authorized_user_file(token_path)
-        except Exception as e:
-            print(f"Warning: Could not load token file: {e}")
-            creds = None
-    
-    # If there are no (valid) credentials available, let the user log in
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                credentials_path, 
-                [
-                    'https://www.googleapis.com/auth/documents',
-                    'https://www.googleapis.com/auth/drive.file',
-                    'https://www.googleapis.com/auth/drive.readonly',
-                    'https://www.googleapis.com/auth/spreadsheets.readonly'
-                ]
-            )
-            creds = flow.run_local_server(port=0)
-        
-        # Save the credentials for the next run
-        with open(token_path, 'w') as token:
-            token.write(creds.to_json())
-    
-    return creds
+            os.stat(credentials_path)
+        except FileNotFoundError:
+            raise GoogleDocsError(f"Credentials file not found: {credentials_path}")
+        try:
+            token_present = os.stat(token_path).st_size > 0
+        except FileNotFoundError:
+            token_present = False
+            print(f"Token file not found: {token_path} (will be created on first auth)")
+
+        # Load existing token if available
+        if token_present:
+            try:
+                creds = Credentials.from_authorized_user_file(token_path)
+            except Exception as e:
+                print(f"Warning: Could not load token file: {e}")
+                creds = None
+
+        # If there are no (valid) credentials available, let the user log in
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(
+                    credentials_path, 
+                    [
+                        'https://www.googleapis.com/auth/documents',
+                        'https://www.googleapis.com/auth/drive.file',
+                        'https://www.googleapis.com/auth/drive.readonly',
+                        'https://www.googleapis.com/auth/spreadsheets.readonly'
+                    ]
+                )
+                creds = flow.run_local_server(port=0)
+
+            # Save the credentials for the next run
+            _save_token(creds, token_path)
+
+        _creds = creds
+        return creds
+
+def _authorized_http() -> "google_auth_httplib2.AuthorizedHttp":
+    """Get this thread's authorized Http, creating it on first use.
+
+    The Http is replaced once it is HTTP_MAX_AGE_SECONDS old, along with the
+    services bound to it.
+    """
+    http = getattr(_local, "http", None)
+    now = time.monotonic()
+    if http is not None and now - _local.http_created > HTTP_MAX_AGE_SECONDS:
+        http.http.close()
+        http = None
+        _local.services = {}
+    if http is None:
+        import google_auth_httplib2
+        import httplib2
+
+        http = google_auth_httplib2.AuthorizedHttp(
+            get_credentials(),
+            http=httplib2.Http(timeout=30),
+        )
+        _local.http = http
+        _local.http_created = now
+    return http
+
+@functools.lru_cache(maxsize=1)
+def _json_model():
+    """Get the request/response model shared by all services.
+
+    Uses orjson to encode request bodies and decode response bodies when it
+    is installed, falling back to the stock JsonModel otherwise.
+    """
+    from googleapiclient.model import JsonModel
+
+    if orjson is None:
+        return JsonModel()
+
+    class OrjsonModel(JsonModel):
+        def serialize(self, body_value):
+            if isinstance(body_value, dict) and "data" not in body_value and self._data_wrapper:
+                body_value = {"data": body_value}
+            try:
+                # Bytes, not str: http.client would encode a str body as latin-1
+                return orjson.dumps(body_value)
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits; let the stdlib encoder handle them
+                return super().serialize(body_value)
+
+        def deserialize(self, content):
+            try:
+                body = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                return super().deserialize(content)
+            if self._data_wrapper and isinstance(body, dict) and "data" in body:
+                body = body["data"]
+            return body
+
+    return OrjsonModel()
+
+@functools.lru_cache(maxsize=None)
+def _discovery_doc(api: str, version: str) -> str:
+    """Read the discovery document bundled with googleapiclient, once per process."""
+    from googleapiclient.discovery_cache import get_static_doc
+
+    doc = get_static_doc(api, version)
+    if doc is None:
+        raise GoogleDocsError(f"No bundled discovery document for {api} {version}")
+    return doc
+
+def _service(api: str, version: str):
+    """Get this thread's service object for an API, building it on first use.
+
+    Uses the discovery document bundled with googleapiclient, held in memory,
+    so building a service never fetches it over the network or re-reads it
+    from disk.
+    """
+    http = _authorized_http()
+    services = getattr(_local, "services", None)
+    if services is None:
+        services = _local.services = {}
+    service = services.get((api, version))
+    if service is None:
+        from googleapiclient.discovery import build_from_document
+        service = build_from_document(_discovery_doc(api, version), http=http, model=_json_model())
+        services[(api, version)] = service
+    return service
 
 def get_docs_service():
-    """Get Google Docs service object."""
-    creds = get_credentials()
-    return build('docs', 'v1', credentials=creds)
+    """Get the cached Google Docs service object, building it on first use."""
+    return _service('docs', 'v1')
+
+def get_drive_service():
+    """Get the cached Google Drive service object, building it on first use."""
+    return _service('drive', 'v3')
 
 # Initialize MCP server
 mcp = FastMCP("googledocs-mcp")
 
+# Upper bound on tool calls talking to Google at once, so a burst of parallel
+# calls doesn't open a connection per worker thread and trip the rate limits.
+MAX_CONCURRENT_TOOL_CALLS = 8
+_tool_slots = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+
+def _tool(name: str, description: str):
+    """Register a tool whose blocking body runs in a worker thread.
+
+    Google API calls block on network I/O, so running tools on the event loop
+    would serialize concurrent tool calls. The MCP-facing wrapper awaits the
+    function via asyncio.to_thread, at most MAX_CONCURRENT_TOOL_CALLS at a
+    time; the function itself is returned unchanged so it can still be called
+    directly.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def run_in_thread(*args, **kwargs):
+            async with _tool_slots:
+                return await asyncio.to_thread(fn, *args, **kwargs)
+
+        mcp.tool(name, description=description)(run_in_thread)
+        return fn
+    return decorator
+
+# Transient API failures are retried with exponential backoff. Reads are safe
+# to repeat on any of these statuses; writes are only retried on 429, where the
+# request was rejected before it was applied, so a retried 5xx can't apply an
+# edit twice. Backoff without a Retry-After is jittered so that concurrent
+# tool calls rejected together don't all retry at the same moment.
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RATE_LIMITED_STATUSES = frozenset({429})
+MAX_ATTEMPTS = 6
+MAX_BACKOFF_SECONDS = 32
+
+def _execute(request, retry_statuses=_RETRYABLE_STATUSES):
+    """Execute an API request, retrying rate-limited and transient failures.
+
+    Waits for the server's Retry-After when one is given, otherwise 1, 2, 4, ...
+    seconds (capped at MAX_BACKOFF_SECONDS), each scaled by a random factor
+    between 0.5 and 1.5. The last HttpError is re-raised. httplib2's own
+    transport errors (e.g. ServerNotFoundError on a DNS failure) aren't
+    OSErrors, so they are re-raised as GoogleDocsError.
+    """
+    import httplib2
+
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return request.execute()
+        except httplib2.HttpLib2Error as e:
+            raise GoogleDocsError(f"Network error: {e}") from e
+        except HttpError as e:
+            if e.resp.status not in retry_statuses or attempt == MAX_ATTEMPTS - 1:
+                raise
+            retry_after = e.resp.get('retry-after', '')
+            if retry_after.isdigit():
+                delay = min(int(retry_after), MAX_BACKOFF_SECONDS)
+            else:
+                delay = min(2 ** attempt, MAX_BACKOFF_SECONDS) * (0.5 + random.random())
+            time.sleep(delay)
+
 def docs_request(operation: str, document_id: str = None, **kwargs):
     """Helper for Google Docs API requests."""
     try:
-        service = get_docs_service()
-        
-        if operation == "create":
-            return service.documents().create(body=kwargs.get('body', {})).execute()
-        elif operation == "get":
-            return service.documents().get(documentId=document_id).execute()
-        elif operation == "copy":
-            # For copying documents, we need Drive API
-            from googleapiclient.discovery import build as build_drive
-            drive_service = build_drive('drive', 'v3', credentials=get_credentials())
-            return drive_service.files().copy(
+        if operation == "copy":
+            # For copying documents, we need Drive API (same cached credentials)
+            _search_results.clear()
+            return _execute(get_drive_service().files().copy(
                 fileId=document_id,
                 body=kwargs.get('body', {})
-            ).execute()
+            ), _RATE_LIMITED_STATUSES)
+
+        documents = get_docs_service().documents()
+        if operation == "create":
+            _search_results.clear()
+            return _execute(documents.create(body=kwargs.get('body', {})), _RATE_LIMITED_STATUSES)
+        elif operation == "get":
+            # An optional fields mask keeps the response to just what the caller reads
+            fields = kwargs.get('fields')
+            if fields:
+                return _execute(documents.get(documentId=document_id, fields=fields))
+            return _execute(documents.get(documentId=document_id))
         elif operation == "batchUpdate":
-            return service.documents().batchUpdate(
-                documentId=document_id, 
-                body=kwargs.get('body', {})
-            ).execute()
+            try:
+                return _execute(documents.batchUpdate(
+                    documentId=document_id, 
+                    body=kwargs.get('body', {})
+                ), _RATE_LIMITED_STATUSES)
+            finally:
+                # Any mutation may change the document length or remove a header/footer
+                _doc_lengths.pop(document_id, None)
+                _forget_segment_ids(document_id)
         else:
-            raise RuntimeError(f"Unknown operation: {operation}")
+            raise GoogleDocsError(f"Unknown operation: {operation}")
             
     except HttpError as e:
-        raise RuntimeError(f"Google Docs API error: {e}")
-    except Exception as e:
-        raise RuntimeError(f"Google Docs request error: {str(e)}")
+        raise GoogleDocsError(f"Google Docs API error: {e}")
 
-def _validate_required(params: Dict[str, Any], required: List[str]):
-    """Raise ValueError if any required params are missing/blank.
+# Recently seen body lengths, keyed by document ID, so repeated index clamping
+# on the same document doesn't re-fetch it. Entries are dropped on batchUpdate.
+DOC_LENGTH_TTL_SECONDS = 30.0
+_doc_lengths: Dict[str, Tuple[float, int]] = {}
 
-    Treats empty strings, None, and empty lists as missing.
+def _doc_length(doc: Dict[str, Any]) -> int:
+    """End index of a fetched document's body (1 for an empty body)."""
+    try:
+        return doc["body"]["content"][-1].get("endIndex", 1)
+    except (KeyError, IndexError):
+        return 1
+
+def _remember_doc_length(document_id: str, doc_length: int) -> None:
+    """Record a body length that is already known, e.g. for a document just created."""
+    _doc_lengths[document_id] = (time.monotonic(), doc_length)
+
+def _get_doc_length(document_id: str, hint: Optional[int] = None, fresh: bool = False) -> int:
+    """Return the end index of the document body, using a recent lookup if any.
+
+    A positive hint from the caller is trusted as-is and skips the lookup.
+    Otherwise edits still waiting in a coalescing window are sent first, so
+    the length includes them. fresh=True always fetches: use it when the
+    length decides what gets deleted, where a stale value would silently leave
+    content behind. It refuses while an open batch holds queued edits, since
+    those aren't in any length the server can report yet.
     """
-    missing = []
-    for key in required:
-        value = params.get(key)
-        if value is None:
-            missing.append(key)
-        elif isinstance(value, str) and value.strip() == "":
-            missing.append(key)
-        elif isinstance(value, (list, dict)) and len(value) == 0:
-            missing.append(key)
-    if missing:
-        raise ValueError(f"Missing required parameter(s): {', '.join(missing)}")
-    return None
+    if hint and hint > 0:
+        return int(hint)
+    _flush_coalesced_now(document_id)
+    if fresh:
+        with _pending_lock:
+            queued = len(_pending_requests.get(document_id) or ())
+        if queued:
+            raise GoogleDocsError(f"Document {document_id} has {queued} queued edit(s) in an open batch; flush it first")
+    cached = _doc_lengths.get(document_id)
+    now = time.monotonic()
+    if not fresh and cached and now - cached[0] < DOC_LENGTH_TTL_SECONDS:
+        return cached[1]
+
+    doc_length = _doc_length(docs_request("get", document_id=document_id, fields="body(content(endIndex))"))
+    _doc_lengths[document_id] = (now, doc_length)
+    return doc_length
+
+# Requests queued by tools while a docs_batch is open, keyed by document ID.
+# The queue lives at module level (not in a ContextVar) because each tool call
+# runs in its own worker thread and context copy; a batch opened by one caller
+# must still capture the mutations made by the tool calls that follow it.
+_pending_requests: Dict[str, List[Dict[str, Any]]] = {}
+_pending_lock = threading.Lock()
+# When each explicitly opened batch was opened. A batch left open longer than
+# BATCH_MAX_AGE_SECONDS is taken to be abandoned, so one caller forgetting to
+# flush can't hold back every later edit to the document indefinitely.
+BATCH_MAX_AGE_SECONDS = 300.0
+_batch_opened: Dict[str, float] = {}
+
+def _batch_expired(document_id: str) -> bool:
+    """True if the document's explicit batch has outlived BATCH_MAX_AGE_SECONDS. Call with _pending_lock held."""
+    opened = _batch_opened.get(document_id)
+    return opened is not None and time.monotonic() - opened > BATCH_MAX_AGE_SECONDS
+
+# With GOOGLEDOCS_COALESCE_MS set, a write to a document with no open batch
+# opens one implicitly and flushes it after that many milliseconds, so a burst
+# of edits to the same document goes out as one batchUpdate. Off by default:
+# coalesced calls return before their edits are applied, with no replies.
+@functools.lru_cache(maxsize=4)
+def _parse_coalesce_ms(raw: Optional[str]) -> float:
+    """Coalescing window in seconds for a GOOGLEDOCS_COALESCE_MS value; 0 if unset or invalid."""
+    if not raw:
+        return 0.0
+    try:
+        ms = float(raw)
+    except ValueError:
+        print(f"Warning: Ignoring invalid GOOGLEDOCS_COALESCE_MS: {raw!r}", file=sys.stderr)
+        return 0.0
+    # Also rules out nan and inf, which would never flush
+    return ms / 1000 if 0 < ms < float("inf") else 0.0
+
+def _coalesce_seconds() -> float:
+    """Read the coalescing window when it's needed, so a value set in .env is honoured."""
+    return _parse_coalesce_ms(get_optional_env("GOOGLEDOCS_COALESCE_MS"))
+# Timers of the implicitly opened batches, keyed by document ID.
+_coalesce_timers: Dict[str, threading.Timer] = {}
+
+def _batch_update(document_id: str, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Send requests to the document, or queue them if a docs_batch is open for it.
+
+    Queued requests are sent when the batch is flushed; until then the result
+    has no replies and reports how many requests are waiting. When coalescing
+    is enabled, a batch is opened here if there isn't one already. An expired
+    batch is closed here and its edits are sent ahead of these requests.
+    """
+    expired = None
+    with _pending_lock:
+        pending = _pending_requests.get(document_id)
+        if pending is not None and _batch_expired(document_id):
+            expired = _pending_requests.pop(document_id)
+            del _batch_opened[document_id]
+            pending = None
+        window = _coalesce_seconds() if pending is None and expired is None else 0.0
+        if window > 0:
+            pending = _pending_requests[document_id] = []
+            timer = threading.Timer(window, _schedule_coalesced_flush, args=(document_id,))
+            timer.daemon = True
+            _coalesce_timers[document_id] = timer
+            timer.start()
+        if pending is not None:
+            pending.extend(requests)
+            return {"documentId": document_id, "replies": [], "queued": len(pending)}
+    if expired:
+        print(f"Warning: Batch for {document_id} was not flushed within {BATCH_MAX_AGE_SECONDS:.0f}s; sending its {len(expired)} queued edit(s)", file=sys.stderr)
+        result = _send_batch(document_id, expired + requests)
+        return {**result, "replies": result["replies"][len(expired):]}
+    return docs_request("batchUpdate", document_id=document_id, body={"requests": requests})
+
+def _queued(result: Dict[str, Any]) -> Dict[str, int]:
+    """{"queued": n} for a _batch_update result that was queued rather than sent, else {}.
+
+    Tools add this to their data so a queued edit, which has no replies yet,
+    can't be mistaken for one that was applied.
+    """
+    return {"queued": result["queued"]} if "queued" in result else {}
 
-def _markdown_to_google_docs_content(markdown_text: str) -> List[Dict[str, Any]]:
-    """Convert markdown text to Google Docs content format.
+@functools.lru_cache(maxsize=1)
+def _coalesce_executor() -> ThreadPoolExecutor:
+    """Get the thread that sends coalesced batches.
+
+    Timer threads are short-lived, so flushing on them would build a new Http
+    and service every time; one long-lived thread keeps its connection.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="coalesce")
+
+def _schedule_coalesced_flush(document_id: str) -> None:
+    """Timer callback: hand the flush to the coalescing thread."""
+    _coalesce_executor().submit(_flush_coalesced, document_id, threading.current_thread())
+
+def _flush_coalesced(document_id: str, timer: threading.Timer) -> None:
+    """Flush an implicitly opened batch, unless it was already flushed or taken over."""
+    with _pending_lock:
+        if _coalesce_timers.get(document_id) is not timer:
+            return
+        del _coalesce_timers[document_id]
+        requests = _pending_requests.pop(document_id)
+    try:
+        _send_batch(document_id, requests)
+    except Exception as e:
+        # Nobody reads this future, so anything raised here would vanish; log it all
+        print(f"Warning: Failed to send {len(requests)} coalesced edit(s) to {document_id}: {type(e).__name__}: {e}", file=sys.stderr)
+
+def _flush_coalesced_now(document_id: str) -> None:
+    """Send the document's coalescing window now and wait until it has been applied.
+
+    The flush runs on the coalescing thread, behind any coalesced send to the
+    document that is already under way, so that one has finished too.
+    """
+    with _pending_lock:
+        timer = _coalesce_timers.get(document_id)
+    if timer is None and not _coalesce_seconds():
+        return
+    if timer is not None:
+        timer.cancel()
+        job = functools.partial(_flush_coalesced, document_id, timer)
+    else:
+        job = lambda: None
+    _coalesce_executor().submit(job).result()
+
+def _cancel_coalescing(document_id: str) -> None:
+    """Stop the document's flush timer, if any. Call with _pending_lock held."""
+    timer = _coalesce_timers.pop(document_id, None)
+    if timer is not None:
+        timer.cancel()
+
+# The Docs API accepts at most this many requests in one batchUpdate.
+MAX_BATCH_REQUESTS = 500
+
+def _open_batch(document_id: str) -> None:
+    """Start queueing the document's tool mutations instead of sending them.
+
+    Edits still waiting in a coalescing window, or in a batch that has expired,
+    become part of the new batch.
+    """
+    with _pending_lock:
+        if document_id in _coalesce_timers:
+            _cancel_coalescing(document_id)
+        elif document_id in _pending_requests and not _batch_expired(document_id):
+            raise GoogleDocsError(f"A batch is already open for document: {document_id}")
+        _pending_requests.setdefault(document_id, [])
+        _batch_opened[document_id] = time.monotonic()
+
+def _flush_batch(document_id: str) -> Dict[str, Any]:
+    """Send everything queued for the document and close its batch.
+
+    Requests go out in order, MAX_BATCH_REQUESTS per batchUpdate. Each
+    batchUpdate is atomic on its own, so if a later one fails the earlier ones
+    have already been applied. The result carries the replies of every request.
+    """
+    with _pending_lock:
+        _cancel_coalescing(document_id)
+        _batch_opened.pop(document_id, None)
+        requests = _pending_requests.pop(document_id, None)
+    if requests is None:
+        raise GoogleDocsError(f"No batch is open for document: {document_id}")
+    return _send_batch(document_id, requests)
+
+def _send_batch(document_id: str, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Send queued requests, MAX_BATCH_REQUESTS per batchUpdate, collecting every reply."""
+    result: Dict[str, Any] = {"documentId": document_id}
+    replies: List[Dict[str, Any]] = []
+    for start in range(0, len(requests), MAX_BATCH_REQUESTS):
+        result = docs_request("batchUpdate", document_id=document_id, body={"requests": requests[start:start + MAX_BATCH_REQUESTS]})
+        replies.extend(result.get("replies", []))
+    return {**result, "replies": replies}
+
+@contextmanager
+def docs_batch(document_id: str):
+    """Collect the mutations tools make to document_id and send them as one batchUpdate.
+
+    Usage:
+        with docs_batch(doc_id) as batch:
+            GOOGLEDOCS_CREATE_PARAGRAPH_BULLETS(...)
+            GOOGLEDOCS_INSERT_PAGE_BREAK(...)
+        batch["replies"]  # replies for every queued request, in order
+
+    Index clamping inside the batch uses the document length as it was before
+    the batch, since queued requests have not been applied yet. If the block
+    raises, the queued requests are discarded.
+    """
+    _open_batch(document_id)
+    result: Dict[str, Any] = {}
+    try:
+        yield result
+    except BaseException:
+        with _pending_lock:
+            _pending_requests.pop(document_id, None)
+            _batch_opened.pop(document_id, None)
+        raise
+    result.update(_flush_batch(document_id))
+
+# Any index at or past this is read as "the end of the document" and sent as
+# endOfSegmentLocation instead of being clamped against a fetched length.
+END_OF_DOCUMENT_INDEX = 10 ** 9
+
+def _with_clamped_index(location: Dict[str, Any], doc_length: int) -> Dict[str, Any]:
+    """Copy of location with its index clamped into the body, leaving the caller's dict untouched."""
+    return {**location, "index": min(max(1, int(location["index"])), max(1, doc_length - 1))}
+
+def _missing(value: Any) -> bool:
+    """True for None, blank strings, and empty lists/dicts."""
+    return value is None or (isinstance(value, str) and not value.strip()) or (isinstance(value, (list, dict)) and not value)
+
+def _requires(*names: str):
+    """Make a tool return a failure result when a named argument is missing/blank.
+
+    Treats empty strings, None, and empty lists as missing. Argument positions
+    are resolved once, when the tool is defined, so a call only does the
+    lookups.
+    """
+    def decorator(fn):
+        params = list(inspect.signature(fn).parameters)
+        positions = tuple((name, params.index(name)) for name in names)
+
+        def failure(args, kwargs):
+            missing = [
+                name for name, pos in positions
+                if _missing(args[pos] if pos < len(args) else kwargs.get(name))
+            ]
+            if missing:
+                return {"data": {}, "error": f"Missing required parameter(s): {', '.join(missing)}", "successful": False}
+            return None
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                return failure(args, kwargs) or await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return failure(args, kwargs) or fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Markdown patterns are compiled once; inline emphasis is scanned in a single
+# left-to-right pass over each line. The italic branch uses lookarounds so a
+# lone '*' next to a '**' marker is never taken for italic. Emphasis bodies are
+# negated classes ([^*]+) with no nested quantifiers, so a failed match stops
+# at the next '*' and long unmatched runs cannot backtrack catastrophically.
+_HEADER_RE = re.compile(r'^(#{1,3})\s+(.*)$')
+_INLINE_RE = re.compile(r'\*\*(?P<b>[^*]+)\*\*|(?<!\*)\*(?P<i>[^*]+)\*(?!\*)')
+_HEADER_STYLES = {
+    level: {"bold": True, "fontSize": {"magnitude": size, "unit": "PT"}}
+    for level, size in ((1, 18), (2, 16), (3, 14))
+}
+
+_BOLD_STYLE = {"bold": True}
+_ITALIC_STYLE = {"italic": True}
+
+def _utf16_len(text: str) -> int:
+    """Length of text in UTF-16 code units, which is how Docs counts indices."""
+    return len(text.encode('utf-16-le')) // 2
+
+def _iter_lines(text: str):
+    """Yield the lines of text one at a time, like text.split('\\n') without the list."""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+# Inputs up to this many characters are memoized; longer ones are converted
+# each time so the cache never pins whole large documents in memory.
+MARKDOWN_CACHE_MAX_CHARS = 4096
+
+def _markdown_to_google_docs_content(markdown_text: str) -> Tuple[str, Tuple[Tuple[int, int, Dict[str, Any]], ...]]:
+    """Convert markdown text to plain text plus the styles to apply to it.
     
     This is a basic implementation that handles:
     - Headers (# ## ###)
@@ -146,161 +678,145 @@ def _markdown_to_google_docs_content(markdown_text: str) -> List[Dict[str, Any]]
     - Italic text (*text*)
     - Line breaks
     - Basic paragraphs
+
+    Returns the text with markdown markers removed (one paragraph per line) and a
+    tuple of (start, end, textStyle) spans whose offsets are UTF-16 code units
+    from the start of that text. Results for short inputs are memoized, so the
+    shared textStyle dicts must be treated as read-only.
     """
-    lines = markdown_text.split('\n')
-    content = []
-    current_index = 1
-    
-    for line in lines:
+    if len(markdown_text) <= MARKDOWN_CACHE_MAX_CHARS:
+        return _convert_markdown_cached(markdown_text)
+    return _convert_markdown(markdown_text)
+
+def _convert_markdown(markdown_text: str) -> Tuple[str, Tuple[Tuple[int, int, Dict[str, Any]], ...]]:
+    """Uncached body of _markdown_to_google_docs_content."""
+    parts: List[str] = []
+    spans: List[Tuple[int, int, Dict[str, Any]]] = []
+    offset = 0
+
+    def emit(text: str, text_style: Optional[Dict[str, Any]] = None):
+        nonlocal offset
+        if not text:
+            return
+        length = _utf16_len(text)
+        if text_style:
+            if spans and spans[-1][1] == offset and spans[-1][2] == text_style:
+                # Extend the previous run instead of emitting another style request
+                spans[-1] = (spans[-1][0], offset + length, text_style)
+            else:
+                spans.append((offset, offset + length, text_style))
+        parts.append(text)
+        offset += length
+
+    for line_number, line in enumerate(_iter_lines(markdown_text)):
+        if line_number:
+            emit("\n")
         if not line.strip():
-            # Empty line - add paragraph break
-            content.append({
-                "endIndex": current_index,
-                "startIndex": current_index - 1,
-                "paragraph": {
-                    "elements": [{"endIndex": current_index, "startIndex": current_index - 1, "textRun": {"content": "\n"}}]
-                }
-            })
-            current_index += 1
+            # Empty line - paragraph break only
             continue
-            
+
         # Check for headers
-        if line.startswith('### '):
-            # H3 header
-            text = line[4:].strip()
-            content.append({
-                "endIndex": current_index + len(text),
-                "startIndex": current_index - 1,
-                "paragraph": {
-                    "elements": [{
-                        "endIndex": current_index + len(text),
-                        "startIndex": current_index - 1,
-                        "textRun": {
-                            "content": text,
-                            "textStyle": {"bold": True, "fontSize": {"magnitude": 14, "unit": "PT"}}
-                        }
-                    }]
-                }
-            })
-            current_index += len(text) + 1
-        elif line.startswith('## '):
-            # H2 header
-            text = line[3:].strip()
-            content.append({
-                "endIndex": current_index + len(text),
-                "startIndex": current_index - 1,
-                "paragraph": {
-                    "elements": [{
-                        "endIndex": current_index + len(text),
-                        "startIndex": current_index - 1,
-                        "textRun": {
-                            "content": text,
-                            "textStyle": {"bold": True, "fontSize": {"magnitude": 16, "unit": "PT"}}
-                        }
-                    }]
-                }
-            })
-            current_index += len(text) + 1
-        elif line.startswith('# '):
-            # H1 header
-            text = line[2:].strip()
-            content.append({
-                "endIndex": current_index + len(text),
-                "startIndex": current_index - 1,
-                "paragraph": {
-                    "elements": [{
-                        "endIndex": current_index + len(text),
-                        "startIndex": current_index - 1,
-                        "textRun": {
-                            "content": text,
-                            "textStyle": {"bold": True, "fontSize": {"magnitude": 18, "unit": "PT"}}
-                        }
-                    }]
-                }
-            })
-            current_index += len(text) + 1
-        else:
-            # Regular paragraph - process bold and italic
-            processed_text = line
-            elements = []
-            start_pos = 0
-            
-            # Simple bold and italic processing
-            while True:
-                # Find next bold or italic
-                bold_match = re.search(r'\*\*(.*?)\*\*', processed_text[start_pos:])
-                italic_match = re.search(r'\*(.*?)\*', processed_text[start_pos:])
-                
-                if not bold_match and not italic_match:
-                    # No more formatting, add remaining text
-                    remaining = processed_text[start_pos:]
-                    if remaining:
-                        elements.append({
-                            "endIndex": current_index + len(remaining),
-                            "startIndex": current_index - 1,
-                            "textRun": {"content": remaining}
-                        })
-                        current_index += len(remaining)
-                    break
-                
-                # Determine which comes first
-                if bold_match and italic_match:
-                    if bold_match.start() < italic_match.start():
-                        match = bold_match
-                        is_bold = True
-                    else:
-                        match = italic_match
-                        is_bold = False
-                elif bold_match:
-                    match = bold_match
-                    is_bold = True
-                else:
-                    match = italic_match
-                    is_bold = False
-                
-                # Add text before the match
-                before_text = processed_text[start_pos:start_pos + match.start()]
-                if before_text:
-                    elements.append({
-                        "endIndex": current_index + len(before_text),
-                        "startIndex": current_index - 1,
-                        "textRun": {"content": before_text}
-                    })
-                    current_index += len(before_text)
-                
-                # Add the formatted text
-                formatted_text = match.group(1)
-                text_style = {"bold": True} if is_bold else {"italic": True}
-                elements.append({
-                    "endIndex": current_index + len(formatted_text),
-                    "startIndex": current_index - 1,
-                    "textRun": {
-                        "content": formatted_text,
-                        "textStyle": text_style
-                    }
-                })
-                current_index += len(formatted_text)
-                
-                # Update start position
-                start_pos += match.end()
-            
-            # Add paragraph with elements
-            if elements:
-                content.append({
-                    "endIndex": current_index,
-                    "startIndex": current_index - 1,
-                    "paragraph": {"elements": elements}
-                })
-                current_index += 1
-    
-    return content
+        header = _HEADER_RE.match(line)
+        if header:
+            emit(header.group(2).strip(), _HEADER_STYLES[len(header.group(1))])
+            continue
+
+        # Regular paragraph - process bold and italic
+        pos = 0
+        for match in _INLINE_RE.finditer(line):
+            emit(line[pos:match.start()])
+            if match.lastgroup == 'b':
+                emit(match.group('b'), _BOLD_STYLE)
+            else:
+                emit(match.group('i'), _ITALIC_STYLE)
+            pos = match.end()
+        emit(line[pos:])
+
+    return "".join(parts), tuple(spans)
+
+_convert_markdown_cached = functools.lru_cache(maxsize=256)(_convert_markdown)
+
+def _markdown_requests(markdown_text: str, index: int = 1) -> List[Dict[str, Any]]:
+    """Build batchUpdate requests that insert converted markdown at index.
+
+    Produces one insertText for the whole text followed by an updateTextStyle
+    per styled span, so the content lands in a single batchUpdate.
+    """
+    text, spans = _markdown_to_google_docs_content(markdown_text)
+    if not text:
+        return []
+    requests: List[Dict[str, Any]] = [{"insertText": {"location": {"index": index}, "text": text}}]
+    for start, end, text_style in spans:
+        requests.append({
+            "updateTextStyle": {
+                "range": {"startIndex": index + start, "endIndex": index + end},
+                "textStyle": text_style,
+                "fields": ",".join(text_style),
+            }
+        })
+    return requests
 
 # -------------------- TOOLS --------------------
 
-@mcp.tool(
+# Failures a tool reports as {"successful": False}: API errors (raised as
+# GoogleDocsError by docs_request, or HttpError from the Sheets/Drive calls),
+# missing configuration, auth failures (including token refreshes that hit the
+# network), and network failures: OSError covers timeouts, refused or dropped
+# connections, unreachable networks and SSL errors, and _execute converts
+# httplib2's own errors. Anything else is a bug and is left to propagate.
+_API_ERRORS = (GoogleDocsError, HttpError, GoogleAuthError, OSError)
+
+def _failure(action: str, error: object, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the result a tool returns when it fails to perform an action.
+
+    data is for anything the tool did manage before failing, e.g. the ID of a
+    document it created, so the caller can act on it instead of retrying blind.
+    """
+    return {"data": data or {}, "error": f"Failed to {action}: {error}", "successful": False}
+
+def _apply_requests(document_id: str, requests: List[Dict[str, Any]], action: str) -> Dict[str, Any]:
+    """Send requests to the document and build the tool result with their replies.
+
+    An empty request list is a no-op, so it succeeds without calling the API.
+    """
+    if not requests:
+        return {"data": {"documentId": document_id, "replies": []}, "error": "", "successful": True}
+    try:
+        result = _batch_update(document_id, requests)
+        return {"data": {"documentId": document_id, "replies": result.get("replies", []), **_queued(result)}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure(action, e)
+
+def _without_blanks(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of fields without the ones that are None or blank strings."""
+    return {key: value for key, value in fields.items() if value is not None and value != ""}
+
+def _simple_request(document_id: str, kind: str, action: str, **fields: Any) -> Dict[str, Any]:
+    """Send a single {kind: fields} request, leaving out fields that are None or blank.
+
+    Shared by the tools whose request is just their arguments under the
+    request type, e.g. _simple_request(doc, "deleteHeader", "delete header",
+    headerId=header_id, tabId=tab_id).
+    """
+    return _apply_requests(document_id, [{kind: _without_blanks(fields)}], action)
+
+def _dedupe_requests(requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop requests identical to an earlier one, keeping the first of each in order."""
+    seen = set()
+    unique = []
+    for request in requests:
+        # Canonical JSON (sorted keys) so key order doesn't make requests differ
+        key = orjson.dumps(request, option=orjson.OPT_SORT_KEYS) if orjson is not None else json.dumps(request, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            unique.append(request)
+    return unique
+
+@_tool(
     "GOOGLEDOCS_CREATE_DOCUMENT",
     description="Create Document. Creates a new Google Docs document using the provided title and, if non-empty, inserts the supplied text at the start of the body. Args: title (str): Name of the document (required). text (str): Initial body text (required; can be empty string). Returns: dict: { data: {documentId, title, revisionId, createdTime, modifiedTime}, error: str, successful: bool }.",
 )
+@_requires("title", "text")
 def GOOGLEDOCS_CREATE_DOCUMENT(
     title: Annotated[str, "The title of the document to create."],
     text: Annotated[str, "Initial text content for the document."]
@@ -318,32 +834,21 @@ def GOOGLEDOCS_CREATE_DOCUMENT(
     Returns:
         dict: Response containing data object with document metadata, error string, and success boolean.
     """
-    err = _validate_required({"title": title, "text": text}, ["title", "text"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-    
     try:
-        body = {"title": title}
+        # Docs ignores body content on create, so the text goes in a follow-up batchUpdate
+        result = docs_request("create", body={"title": title})
+    except _API_ERRORS as e:
+        return _failure("create document", e)
+
+    try:
         if text.strip():
-            body["body"] = {
-                "content": [
-                    {
-                        "endIndex": 1,
-                        "startIndex": 1,
-                        "paragraph": {
-                            "elements": [
-                                {
-                                    "endIndex": len(text) + 1,
-                                    "startIndex": 1,
-                                    "textRun": {"content": text}
-                                }
-                            ]
-                        }
-                    }
-                ]
-            }
-    
-        result = docs_request("create", body=body)
+            requests = [{"insertText": {"location": {"index": 1}, "text": text}}]
+            update = docs_request("batchUpdate", document_id=result.get("documentId"), body={"requests": requests})
+            result["revisionId"] = update.get("writeControl", {}).get("requiredRevisionId", result.get("revisionId"))
+            # A new body ends at index 2; the inserted text extends it
+            _remember_doc_length(result.get("documentId"), 2 + _utf16_len(text))
+        else:
+            _remember_doc_length(result.get("documentId"), 2)
         
         return {
             "data": {
@@ -357,20 +862,18 @@ def GOOGLEDOCS_CREATE_DOCUMENT(
             "successful": True
         }
         
-    except Exception as e:
-        return {
-            "data": {},
-            "error": f"Failed to create document: {str(e)}",
-            "successful": False
-        }
+    except _API_ERRORS as e:
+        # The document exists by now: return its ID so a retry doesn't create another
+        return _failure("add text to the new document", e, {"documentId": result.get("documentId"), "title": result.get("title")})
 
 
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_COPY_DOCUMENT",
     description="Copy Document. Duplicates an existing Google Docs file using the Drive API. Useful for templating. If no title is provided, Drive assigns a default (e.g., 'Copy of <title>'). Args: document_id (str): Source Docs file ID (required). title (str): New title (optional). Returns: dict: { data: {id, name, mimeType, parents}, error: str, successful: bool }.",
 )
+@_requires("document_id")
 def GOOGLEDOCS_COPY_DOCUMENT(
     document_id: Annotated[str, "The ID of the Google Docs document to copy."],
     title: Annotated[Optional[str], "The title for the copied document. If not provided, will use 'Copy of [original title]'."] = None
@@ -390,16 +893,12 @@ def GOOGLEDOCS_COPY_DOCUMENT(
     Returns:
         dict: Response containing data object with copied document information, error string, and success boolean.
     """
-    err = _validate_required({"document_id": document_id}, ["document_id"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-    
+    # Prepare the copy request body
+    copy_body = {}
+    if title:
+        copy_body["name"] = title
+
     try:
-        # Prepare the copy request body
-        copy_body = {}
-        if title:
-            copy_body["name"] = title
-        
         # Execute the copy operation
         result = docs_request("copy", document_id=document_id, body=copy_body)
         
@@ -414,17 +913,14 @@ def GOOGLEDOCS_COPY_DOCUMENT(
             "successful": True
         }
         
-    except Exception as e:
-        return {
-            "data": {},
-            "error": f"Failed to copy document: {str(e)}",
-            "successful": False
-        }
+    except _API_ERRORS as e:
+        return _failure("copy document", e)
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_CREATE_DOCUMENT_MARKDOWN",
     description="Create Document (Markdown). Converts provided markdown to formatted Google Docs content (basic headers, bold, italic, paragraphs) and creates a new document. Args: title (str): Document title (required). markdown_text (str): Markdown content to convert and insert (required). Returns: dict: { data: {documentId, title, revisionId, createdTime, modifiedTime}, error: str, successful: bool }.",
 )
+@_requires("title", "markdown_text")
 def GOOGLEDOCS_CREATE_DOCUMENT_MARKDOWN(
     title: Annotated[str, "The title of the document to create."],
     markdown_text: Annotated[str, "The markdown content to convert and insert into the document."]
@@ -442,20 +938,23 @@ def GOOGLEDOCS_CREATE_DOCUMENT_MARKDOWN(
     Returns:
         dict: Response containing data object with document metadata, error string, and success boolean.
     """
-    err = _validate_required({"title": title, "markdown_text": markdown_text}, ["title", "markdown_text"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-    
+    # Convert markdown to Google Docs requests
+    requests = _markdown_requests(markdown_text)
+
     try:
-        # Convert markdown to Google Docs content format
-        content = _markdown_to_google_docs_content(markdown_text)
-        
-        # Create document body
-        body = {"title": title}
-        if content:
-            body["body"] = {"content": content}
-        
-        result = docs_request("create", body=body)
+        result = docs_request("create", body={"title": title})
+    except _API_ERRORS as e:
+        return _failure("create markdown document", e)
+
+    try:
+        if requests:
+            # Text and all style ranges are applied in one batchUpdate
+            update = docs_request("batchUpdate", document_id=result.get("documentId"), body={"requests": requests})
+            result["revisionId"] = update.get("writeControl", {}).get("requiredRevisionId", result.get("revisionId"))
+            # A new body ends at index 2; the inserted text extends it
+            _remember_doc_length(result.get("documentId"), 2 + _utf16_len(requests[0]["insertText"]["text"]))
+        else:
+            _remember_doc_length(result.get("documentId"), 2)
         
         return {
             "data": {
@@ -469,20 +968,18 @@ def GOOGLEDOCS_CREATE_DOCUMENT_MARKDOWN(
             "successful": True
         }
         
-    except Exception as e:
-        return {
-            "data": {},
-            "error": f"Failed to create markdown document: {str(e)}",
-            "successful": False
-        }
+    except _API_ERRORS as e:
+        # The document exists by now: return its ID so a retry doesn't create another
+        return _failure("add content to the new document", e, {"documentId": result.get("documentId"), "title": result.get("title")})
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_CREATE_FOOTNOTE",
     description="Create Footnote. Inserts a footnote reference at a specific index or at an end-of-segment location; automatically clamps out-of-range indices to a valid position. Args: documentId (str): Target Docs ID (required). location (dict): { index } insertion point (optional). endOfSegmentLocation (dict): end-of-segment location (optional). Returns: dict: { data: {documentId, location, endOfSegmentLocation, replies}, error: str, successful: bool }.",
 )
+@_requires("documentId")
 def GOOGLEDOCS_CREATE_FOOTNOTE(
     documentId: Annotated[str, "The ID of the Google Docs document to add a footnote to."],
-    location: Annotated[Optional[Dict[str, Any]], "The location where the footnote reference should be inserted. If not provided, footnote will be added at the beginning of the document."] = None,
+    location: Annotated[Optional[Dict[str, Any]], "The location where the footnote reference should be inserted. If not provided, footnote will be added at the end of the document body."] = None,
     endOfSegmentLocation: Annotated[Optional[Dict[str, Any]], "Alternative location for the footnote reference. If both location and endOfSegmentLocation are provided, location takes precedence."] = None
 ):
     """Creates a new footnote in a Google document.
@@ -493,79 +990,84 @@ def GOOGLEDOCS_CREATE_FOOTNOTE(
     Args:
         documentId (str): The ID of the Google Docs document to add a footnote to.
         location (dict, optional): The location where the footnote reference should be inserted. 
-            If not provided, footnote will be added at the beginning of the document.
+            If not provided, footnote will be added at the end of the document body.
         endOfSegmentLocation (dict, optional): Alternative location for the footnote reference. 
             If both location and endOfSegmentLocation are provided, location takes precedence.
 
     Returns:
         dict: Response containing data object with footnote information, error string, and success boolean.
     """
-    err = _validate_required({"documentId": documentId}, ["documentId"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    # Prepare the batch update request
+    requests = []
     
+    # Create footnote request - Google Docs API uses different field structure
+    footnote_request = {
+        "createFootnote": {}
+    }
+
     try:
-        # First, get the document to understand its structure and length
-        doc = docs_request("get", document_id=documentId)
-        
-        # Get the document length
-        body_content = doc.get("body", {}).get("content", [])
-        if body_content:
-            # Find the last element to get the document length
-            last_element = body_content[-1]
-            doc_length = last_element.get("endIndex", 1)
-        else:
-            doc_length = 1
-        
-        # Prepare the batch update request
-        requests = []
-        
-        # Create footnote request - Google Docs API uses different field structure
-        footnote_request = {
-            "createFootnote": {}
-        }
-        
         # Add footnote reference location (required by API)
         if location:
-            # Validate the location index
-            if "index" in location and location["index"] >= doc_length:
-                location["index"] = doc_length - 1  # Place at end of document
+            # Validate the location index against the document length
+            if "index" in location:
+                doc_length = _get_doc_length(documentId)
+                if location["index"] >= doc_length:
+                    location = {**location, "index": doc_length - 1}  # Place at end of document
             footnote_request["createFootnote"]["location"] = location
         elif endOfSegmentLocation:
             footnote_request["createFootnote"]["endOfSegmentLocation"] = endOfSegmentLocation
         else:
-            # If no location provided, use a valid location within the document
-            valid_index = max(1, doc_length - 1)
-            footnote_request["createFootnote"]["location"] = {"index": valid_index}
+            # No location provided: the end of the body needs no length lookup
+            footnote_request["createFootnote"]["endOfSegmentLocation"] = {}
         
         requests.append(footnote_request)
         
         # Execute the batch update
-        body = {"requests": requests}
-        result = docs_request("batchUpdate", document_id=documentId, body=body)
+        result = _batch_update(documentId, requests)
         
         return {
             "data": {
                 "documentId": documentId,
                 "location": location,
                 "endOfSegmentLocation": endOfSegmentLocation,
-                "replies": result.get("replies", [])
+                "replies": result.get("replies", []), **_queued(result)
             },
             "error": "",
             "successful": True
         }
         
-    except Exception as e:
-        return {
-            "data": {},
-            "error": f"Failed to create footnote: {str(e)}",
-            "successful": False
-        }
+    except _API_ERRORS as e:
+        return _failure("create footnote", e)
+
+# Header/footer IDs from createHeader/createFooter replies, per (documentId,
+# type), so asking again for a header just created returns it without a
+# failing createHeader call. Only default-section requests are cached.
+# docs_request drops a document's entries on every batchUpdate, since any of
+# them may delete the header; entries also expire after SEGMENT_ID_TTL_SECONDS,
+# which bounds how long a header deleted elsewhere (e.g. in the Docs UI) can
+# still be reported.
+SEGMENT_ID_TTL_SECONDS = 30.0
+_header_ids: Dict[Tuple[str, str], Tuple[float, str]] = {}
+_footer_ids: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+def _cached_segment_id(cache: Dict[Tuple[str, str], Tuple[float, str]], key: Tuple[str, str]) -> Optional[str]:
+    """The header/footer ID cached under key, or None if there is none or it has expired."""
+    cached = cache.get(key)
+    if cached and time.monotonic() - cached[0] < SEGMENT_ID_TTL_SECONDS:
+        return cached[1]
+    return None
 
-@mcp.tool(
+def _forget_segment_ids(document_id: str) -> None:
+    """Drop the cached header/footer IDs of a document."""
+    for segment_type in ("DEFAULT", "FIRST_PAGE"):
+        _header_ids.pop((document_id, segment_type), None)
+        _footer_ids.pop((document_id, segment_type), None)
+
+@_tool(
     "GOOGLEDOCS_CREATE_HEADER",
     description="Create Header. Adds a header to the document (DEFAULT or FIRST_PAGE). If FIRST_PAGE is requested, the tool enables first-page headers automatically. Args: documentId (str): Docs ID (required). createHeader (dict): { type: 'DEFAULT'|'FIRST_PAGE', sectionBreakLocation? } (required). Returns: dict: { data: {documentId, createHeader, replies}, error: str, successful: bool }.",
 )
+@_requires("documentId", "createHeader")
 def GOOGLEDOCS_CREATE_HEADER(
     documentId: Annotated[str, "The ID of the Google Docs document to add a header to."],
     createHeader: Annotated[Dict[str, Any], "The header configuration object containing type and optional section information."]
@@ -582,59 +1084,72 @@ def GOOGLEDOCS_CREATE_HEADER(
     Returns:
         dict: Response containing data object with header information, error string, and success boolean.
     """
-    err = _validate_required({"documentId": documentId, "createHeader": createHeader}, ["documentId", "createHeader"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    cache_key = None
+
+    # Prepare the batch update request
+    requests = []
     
-    try:
-        # Prepare the batch update request
-        requests = []
-        
-        # Create header request - ensure a valid type is always sent
-        requested_type = createHeader.get("type") if isinstance(createHeader, dict) else None
-        # Normalize common aliases to valid API enum values
-        type_mapping = {
-            "DEFAULT_HEADER": "DEFAULT",
-            "FIRST_PAGE_HEADER": "FIRST_PAGE",
-            "HEADER_FOOTER_TYPE_UNSPECIFIED": "DEFAULT",  # fall back to DEFAULT
+    # Create header request - ensure a valid type is always sent
+    requested_type = createHeader.get("type") if isinstance(createHeader, dict) else None
+    # Normalize common aliases to valid API enum values
+    type_mapping = {
+        "DEFAULT_HEADER": "DEFAULT",
+        "FIRST_PAGE_HEADER": "FIRST_PAGE",
+        "HEADER_FOOTER_TYPE_UNSPECIFIED": "DEFAULT",  # fall back to DEFAULT
+    }
+    normalized_type = type_mapping.get(requested_type, requested_type)
+    if normalized_type not in ("DEFAULT", "FIRST_PAGE"):
+        normalized_type = "DEFAULT"
+
+    header_request = {
+        "createHeader": {
+            "type": normalized_type
         }
-        normalized_type = type_mapping.get(requested_type, requested_type)
-        if normalized_type not in ("DEFAULT", "FIRST_PAGE"):
-            normalized_type = "DEFAULT"
-
-        header_request = {
-            "createHeader": {
-                "type": normalized_type
+    }
+    
+    # Add sectionBreakLocation if provided
+    if "sectionBreakLocation" in createHeader:
+        header_request["createHeader"]["sectionBreakLocation"] = createHeader["sectionBreakLocation"]
+    else:
+        cache_key = (documentId, normalized_type)
+        cached_id = _cached_segment_id(_header_ids, cache_key)
+        if cached_id:
+            return {
+                "data": {
+                    "documentId": documentId,
+                    "createHeader": createHeader,
+                    "replies": [{"createHeader": {"headerId": cached_id}}]
+                },
+                "error": "",
+                "successful": True
             }
-        }
-        
-        # Add sectionBreakLocation if provided
-        if "sectionBreakLocation" in createHeader:
-            header_request["createHeader"]["sectionBreakLocation"] = createHeader["sectionBreakLocation"]
-        
-        requests.append(header_request)
-        
+    
+    requests.append(header_request)
+
+    try:
         # Execute the batch update
-        body = {"requests": requests}
-        result = docs_request("batchUpdate", document_id=documentId, body=body)
+        result = _batch_update(documentId, requests)
+        created_id = (result.get("replies") or [{}])[0].get("createHeader", {}).get("headerId")
+        if cache_key and created_id:
+            _header_ids[cache_key] = (time.monotonic(), created_id)
         
         return {
             "data": {
                 "documentId": documentId,
                 "createHeader": createHeader,
-                "replies": result.get("replies", [])
+                "replies": result.get("replies", []), **_queued(result)
             },
             "error": "",
             "successful": True
         }
         
-    except Exception as e:
+    except _API_ERRORS as e:
         error_str = str(e)
         # Check if the error is because header already exists
         if "already exists" in error_str:
             # Get the existing header ID from the document
             try:
-                doc = docs_request("get", document_id=documentId)
+                doc = docs_request("get", document_id=documentId, fields="headers")
                 headers = doc.get("headers", {})
                 if headers:
                     # Get the first header ID
@@ -652,19 +1167,16 @@ def GOOGLEDOCS_CREATE_HEADER(
                         "error": "",
                         "successful": True
                     }
-            except:
+            except _API_ERRORS:
                 pass
         
-        return {
-            "data": {},
-            "error": f"Failed to create header: {error_str}",
-            "successful": False
-        }
+        return _failure("create header", error_str)
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_CREATE_FOOTER",
     description="Create Footer. Tool to create a new footer in a Google document. Use when you need to add a footer, optionally specifying its type and the section it applies to. Args: document_id (str): Docs ID (required). createFooter (dict): { type: 'DEFAULT'|'FIRST_PAGE', sectionBreakLocation? } (required). Returns: dict: { data: {documentId, createFooter, replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "createFooter")
 def GOOGLEDOCS_CREATE_FOOTER(
     document_id: Annotated[str, "The ID of the Google Docs document to add a footer to."],
     createFooter: Annotated[Dict[str, Any], "The footer configuration object containing type and optional section information."]
@@ -681,60 +1193,73 @@ def GOOGLEDOCS_CREATE_FOOTER(
     Returns:
         dict: Response containing data object with footer information, error string, and success boolean.
     """
-    err = _validate_required({"document_id": document_id, "createFooter": createFooter}, ["document_id", "createFooter"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    cache_key = None
+
+    # Prepare the batch update request
+    requests = []
     
-    try:
-        # Prepare the batch update request
-        requests = []
-        
-        # Create footer request - ensure a valid type is always sent
-        requested_type = createFooter.get("type") if isinstance(createFooter, dict) else None
-        # Normalize common aliases to valid API enum values
-        type_mapping = {
-            "DEFAULT_FOOTER": "DEFAULT",
-            "FIRST_PAGE_FOOTER": "FIRST_PAGE",
-            "HEADER_FOOTER_TYPE_UNSPECIFIED": "DEFAULT",  # fall back to DEFAULT
+    # Create footer request - ensure a valid type is always sent
+    requested_type = createFooter.get("type") if isinstance(createFooter, dict) else None
+    # Normalize common aliases to valid API enum values
+    type_mapping = {
+        "DEFAULT_FOOTER": "DEFAULT",
+        "FIRST_PAGE_FOOTER": "FIRST_PAGE",
+        "HEADER_FOOTER_TYPE_UNSPECIFIED": "DEFAULT",  # fall back to DEFAULT
+    }
+    normalized_type = type_mapping.get(requested_type, requested_type)
+    if normalized_type not in ("DEFAULT", "FIRST_PAGE"):
+        normalized_type = "DEFAULT"
+
+    # Try using the exact structure that worked before
+    footer_request = {
+        "createFooter": {
+            "type": normalized_type
         }
-        normalized_type = type_mapping.get(requested_type, requested_type)
-        if normalized_type not in ("DEFAULT", "FIRST_PAGE"):
-            normalized_type = "DEFAULT"
-
-        # Try using the exact structure that worked before
-        footer_request = {
-            "createFooter": {
-                "type": normalized_type
+    }
+    
+    # Add sectionBreakLocation if provided
+    if "sectionBreakLocation" in createFooter:
+        footer_request["createFooter"]["sectionBreakLocation"] = createFooter["sectionBreakLocation"]
+    else:
+        cache_key = (document_id, normalized_type)
+        cached_id = _cached_segment_id(_footer_ids, cache_key)
+        if cached_id:
+            return {
+                "data": {
+                    "documentId": document_id,
+                    "createFooter": createFooter,
+                    "replies": [{"createFooter": {"footerId": cached_id}}]
+                },
+                "error": "",
+                "successful": True
             }
-        }
-        
-        # Add sectionBreakLocation if provided
-        if "sectionBreakLocation" in createFooter:
-            footer_request["createFooter"]["sectionBreakLocation"] = createFooter["sectionBreakLocation"]
-        
-        requests.append(footer_request)
-        
+    
+    requests.append(footer_request)
+
+    try:
         # Execute the batch update
-        body = {"requests": requests}
-        result = docs_request("batchUpdate", document_id=document_id, body=body)
+        result = _batch_update(document_id, requests)
+        created_id = (result.get("replies") or [{}])[0].get("createFooter", {}).get("footerId")
+        if cache_key and created_id:
+            _footer_ids[cache_key] = (time.monotonic(), created_id)
         
         return {
             "data": {
                 "documentId": document_id,
                 "createFooter": createFooter,
-                "replies": result.get("replies", [])
+                "replies": result.get("replies", []), **_queued(result)
             },
             "error": "",
             "successful": True
         }
         
-    except Exception as e:
+    except _API_ERRORS as e:
         error_str = str(e)
         # Check if the error is because footer already exists
         if "already exists" in error_str:
             # Get the existing footer ID from the document
             try:
-                doc = docs_request("get", document_id=document_id)
+                doc = docs_request("get", document_id=document_id, fields="footers")
                 footers = doc.get("footers", {})
                 if footers:
                     # Get the first footer ID
@@ -752,26 +1277,24 @@ def GOOGLEDOCS_CREATE_FOOTER(
                         "error": "",
                         "successful": True
                     }
-            except:
+            except _API_ERRORS:
                 pass
         
-        return {
-            "data": {},
-            "error": f"Failed to create footer: {error_str}",
-            "successful": False
-        }
+        return _failure("create footer", error_str)
 
 # New tool: Create Named Range
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_CREATE_NAMED_RANGE",
-    description="Create Named Range. Defines a named range over a start/end index span; indices are validated against the document length and clamped if needed. Args: documentId (str): Docs ID (required). name (str): Named range label (required). rangeStartIndex (int): Inclusive start index (required). rangeEndIndex (int): Exclusive end index (required). rangeSegmentId (str): Segment ID for headers/footers (optional). Returns: dict: { data: {documentId, name, range, replies}, error: str, successful: bool }.",
+    description="Create Named Range. Defines a named range over a start/end index span; indices are validated against the document length and clamped if needed. Args: documentId (str): Docs ID (required). name (str): Named range label (required). rangeStartIndex (int): Inclusive start index (required). rangeEndIndex (int): Exclusive end index (required). rangeSegmentId (str): Segment ID for headers/footers (optional). documentLengthHint (int): Known body end index; skips the length lookup when clamping (optional). Returns: dict: { data: {documentId, name, range, replies}, error: str, successful: bool }.",
 )
+@_requires("documentId", "name", "rangeStartIndex", "rangeEndIndex")
 def GOOGLEDOCS_CREATE_NAMED_RANGE(
     documentId: Annotated[str, "The ID of the Google Docs document to add the named range to."],
     name: Annotated[str, "The name to assign to the range."],
     rangeStartIndex: Annotated[int, "The start index of the range (inclusive)."],
     rangeEndIndex: Annotated[int, "The end index of the range (exclusive)."],
     rangeSegmentId: Annotated[Optional[str], "The segmentId for the range (omit for body)."] = None,
+    documentLengthHint: Annotated[Optional[int], "Known end index of the document body, e.g. from a previous call; when given, indices are clamped against it without fetching the document."] = None,
 ):
     """Creates a named range in a Google document.
 
@@ -788,22 +1311,9 @@ def GOOGLEDOCS_CREATE_NAMED_RANGE(
     Returns:
         dict: Response containing data object with named range info, error string, and success boolean.
     """
-    err = _validate_required(
-        {"documentId": documentId, "name": name, "rangeStartIndex": rangeStartIndex, "rangeEndIndex": rangeEndIndex},
-        ["documentId", "name", "rangeStartIndex", "rangeEndIndex"],
-    )
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
     try:
-        # Fetch document to determine valid index bounds
-        doc = docs_request("get", document_id=documentId)
-        body_content = doc.get("body", {}).get("content", [])
-        if body_content:
-            last_element = body_content[-1]
-            doc_length = last_element.get("endIndex", 1)
-        else:
-            doc_length = 1
+        # Determine valid index bounds from the (cached) document length
+        doc_length = _get_doc_length(documentId, documentLengthHint)
 
         # Normalize indices to valid bounds
         start_index = max(1, int(rangeStartIndex))
@@ -817,20 +1327,13 @@ def GOOGLEDOCS_CREATE_NAMED_RANGE(
                 "successful": False,
             }
 
-        create_named_range = {
-            "createNamedRange": {
-                "name": name,
-                "range": {
-                    "startIndex": start_index,
-                    "endIndex": end_index,
-                },
-            }
-        }
         if rangeSegmentId:
-            create_named_range["createNamedRange"]["range"]["segmentId"] = rangeSegmentId
+            named_range = {"startIndex": start_index, "endIndex": end_index, "segmentId": rangeSegmentId}
+        else:
+            named_range = {"startIndex": start_index, "endIndex": end_index}
+        create_named_range = {"createNamedRange": {"name": name, "range": named_range}}
 
-        body = {"requests": [create_named_range]}
-        result = docs_request("batchUpdate", document_id=documentId, body=body)
+        result = _batch_update(documentId, [create_named_range])
 
         return {
             "data": {
@@ -841,24 +1344,24 @@ def GOOGLEDOCS_CREATE_NAMED_RANGE(
                     "endIndex": end_index,
                     **({"segmentId": rangeSegmentId} if rangeSegmentId else {}),
                 },
-                "replies": result.get("replies", []),
+                "replies": result.get("replies", []), **_queued(result),
             },
             "error": "",
             "successful": True,
         }
 
-    except Exception as e:
-        return {
-            "data": {},
-            "error": f"Failed to create named range: {str(e)}",
-            "successful": False,
-        }
+    except _API_ERRORS as e:
+        return _failure("create named range", e)
+
+# bulletPreset values the API rejects; dropping them lets it use the default preset
+_UNSPECIFIED_BULLET_PRESETS = frozenset({"BULLET_GLYPH_PRESET_UNSPECIFIED", ""})
 
 # Add bullets to paragraphs
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_CREATE_PARAGRAPH_BULLETS",
     description="Create Paragraph Bullets. Applies bullet formatting to paragraphs fully or partially covered by the provided text range; removes unspecified presets that are rejected by the API. Args: document_id (str): Docs ID (required). createParagraphBullets (dict): { range: {startIndex,endIndex[,segmentId]}, bulletPreset? } (required). Returns: dict: { data: {documentId, createParagraphBullets, replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "createParagraphBullets")
 def GOOGLEDOCS_CREATE_PARAGRAPH_BULLETS(
     document_id: Annotated[str, "The ID of the Google Docs document to update."],
     createParagraphBullets: Annotated[Dict[str, Any], "The request object including range (startIndex/endIndex[/segmentId]) and optional bullet settings like bulletPreset."]
@@ -872,21 +1375,11 @@ def GOOGLEDOCS_CREATE_PARAGRAPH_BULLETS(
     Returns:
         dict: Response with replies from Docs API.
     """
-    err = _validate_required({"document_id": document_id, "createParagraphBullets": createParagraphBullets}, ["document_id", "createParagraphBullets"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
     try:
-        # Fetch document to clamp indices
-        doc = docs_request("get", document_id=document_id)
-        body_content = doc.get("body", {}).get("content", [])
-        if body_content:
-            doc_length = body_content[-1].get("endIndex", 1)
-        else:
-            doc_length = 1
+        # Clamp indices against the (cached) document length
+        doc_length = _get_doc_length(document_id)
 
-        request_obj = dict(createParagraphBullets or {})
-        rng = request_obj.get("range") or {}
+        rng = createParagraphBullets.get("range") or {}
         start_index = int(rng.get("startIndex", 1))
         end_index = int(rng.get("endIndex", start_index + 1))
         # Clamp to valid bounds
@@ -897,39 +1390,73 @@ def GOOGLEDOCS_CREATE_PARAGRAPH_BULLETS(
         if "segmentId" in rng and rng["segmentId"]:
             new_range["segmentId"] = rng["segmentId"]
 
-        request_obj["range"] = new_range
-        
-        # If preset is explicitly UNSPECIFIED, remove it so the API uses default.
-        if "bulletPreset" in request_obj:
-            if str(request_obj["bulletPreset"]).strip() == "BULLET_GLYPH_PRESET_UNSPECIFIED":
-                del request_obj["bulletPreset"]
+        request_obj = {**createParagraphBullets, "range": new_range}
+
+        # If preset is explicitly UNSPECIFIED (or empty), remove it so the API uses default.
+        preset = request_obj.get("bulletPreset")
+        if preset is None or (isinstance(preset, str) and preset.strip() in _UNSPECIFIED_BULLET_PRESETS):
+            request_obj.pop("bulletPreset", None)
 
-        body = {"requests": [{"createParagraphBullets": request_obj}]}
-        result = docs_request("batchUpdate", document_id=document_id, body=body)
+        result = _batch_update(document_id, [{"createParagraphBullets": request_obj}])
 
         return {
             "data": {
                 "documentId": document_id,
                 "createParagraphBullets": request_obj,
-                "replies": result.get("replies", []),
+                "replies": result.get("replies", []), **_queued(result),
             },
             "error": "",
             "successful": True,
         }
 
-    except Exception as e:
-        return {
-            "data": {},
-            "error": f"Failed to create paragraph bullets: {str(e)}",
-            "successful": False,
-        }
+    except _API_ERRORS as e:
+        return _failure("create paragraph bullets", e)
 
 # -------------------- GOOGLE SHEETS TOOLS --------------------
 
-@mcp.tool(
+# Spreadsheet metadata fetched by the chart tools, keyed by (spreadsheet ID,
+# fields mask), so a repeated listing within the TTL is served from memory.
+SHEET_META_TTL_SECONDS = 30.0
+SHEET_META_CACHE_SIZE = 64
+_sheet_meta: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+
+def _fetch_sheet_meta(spreadsheet_id: str, fields: str) -> Dict[str, Any]:
+    """Get spreadsheet metadata (no grid data) for a fields mask, using a recent fetch if any.
+
+    The returned dict is shared with the cache and must be treated as read-only.
+    """
+    key = (spreadsheet_id, fields)
+    cached = _sheet_meta.get(key)
+    now = time.monotonic()
+    if cached and now - cached[0] < SHEET_META_TTL_SECONDS:
+        return cached[1]
+
+    resp = _execute(_service('sheets', 'v4').spreadsheets().get(
+        spreadsheetId=spreadsheet_id,
+        includeGridData=False,
+        fields=fields
+    ))
+    if len(_sheet_meta) >= SHEET_META_CACHE_SIZE:
+        _sheet_meta.clear()
+    _sheet_meta[key] = (now, resp)
+    return resp
+
+def _iter_sheets_with_charts(spreadsheet: Dict[str, Any]):
+    """Yield {sheetTitle, charts} for each sheet that has charts.
+
+    The charts are passed through as returned, so the fields mask used for
+    spreadsheets.get decides what each chart contains.
+    """
+    for sheet in spreadsheet.get('sheets', []):
+        charts = sheet.get('charts')
+        if charts:
+            yield {'sheetTitle': sheet.get('properties', {}).get('title'), 'charts': charts}
+
+@_tool(
     "GOOGLEDOCS_GET_CHARTS_FROM_SPREADSHEET",
     description="Get Charts from Spreadsheet. Retrieves all embedded charts across sheets in a spreadsheet and returns each chart's ID and spec. Args: spreadsheet_id (str): Google Sheets ID (required). Returns: dict: { data: {spreadsheetId, sheetsWithCharts: [{sheetTitle, charts: [{chartId,spec}]}]}, error: str, successful: bool }.",
 )
+@_requires("spreadsheet_id")
 def GOOGLEDOCS_GET_CHARTS_FROM_SPREADSHEET(
     spreadsheet_id: Annotated[str, "The ID of the Google Sheets spreadsheet to inspect for charts."]
 ):
@@ -941,37 +1468,11 @@ def GOOGLEDOCS_GET_CHARTS_FROM_SPREADSHEET(
     Returns:
         dict: data with list of charts per sheet, error, successful.
     """
-    err = _validate_required({"spreadsheet_id": spreadsheet_id}, ["spreadsheet_id"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
     try:
-        from googleapiclient.discovery import build as build_sheets
-        creds = get_credentials()
-        sheets_service = build_sheets('sheets', 'v4', credentials=creds)
-
-        resp = sheets_service.spreadsheets().get(
-            spreadsheetId=spreadsheet_id,
-            includeGridData=False,
-            fields='spreadsheetId,sheets(properties(title),charts(chartId,spec))'
-        ).execute()
-
-        sheets = resp.get('sheets', [])
-        charts_summary = []
-        for sh in sheets:
-            sheet_title = sh.get('properties', {}).get('title')
-            charts = sh.get('charts', []) or []
-            extracted = []
-            for ch in charts:
-                extracted.append({
-                    'chartId': ch.get('chartId'),
-                    'spec': ch.get('spec')
-                })
-            if extracted:
-                charts_summary.append({
-                    'sheetTitle': sheet_title,
-                    'charts': extracted
-                })
+        resp = _fetch_sheet_meta(spreadsheet_id, 'spreadsheetId,sheets(properties(title),charts(chartId,spec))')
+
+        # The fields mask already limits each chart to chartId and spec
+        charts_summary = list(_iter_sheets_with_charts(resp))
 
         return {
             'data': {
@@ -981,19 +1482,16 @@ def GOOGLEDOCS_GET_CHARTS_FROM_SPREADSHEET(
             'error': '',
             'successful': True
         }
-    except Exception as e:
-        return {
-            'data': {},
-            'error': f'Failed to get charts: {str(e)}',
-            'successful': False
-        }
+    except _API_ERRORS as e:
+        return _failure("get charts", e)
 
 # -------------------- GOOGLE DOCS UTILITIES --------------------
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_GET_DOCUMENT_BY_ID",
     description="Get Document by ID. Fetches an existing Google Docs document by its ID; returns 404-style error information if not found. Args: id (str): Document ID (required). Returns: dict: { data: {documentId, title, revisionId, body}, error: str, successful: bool }.",
 )
+@_requires("id")
 def GOOGLEDOCS_GET_DOCUMENT_BY_ID(
     id: Annotated[str, "The Google Docs document ID to retrieve."]
 ):
@@ -1005,12 +1503,8 @@ def GOOGLEDOCS_GET_DOCUMENT_BY_ID(
     Returns:
         dict: Response containing data with document info, error string, and success boolean.
     """
-    err = _validate_required({"id": id}, ["id"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
     try:
-        result = docs_request("get", document_id=id)
+        result = docs_request("get", document_id=id, fields="documentId,title,revisionId,body")
         return {
             "data": {
                 "documentId": result.get("documentId"),
@@ -1021,55 +1515,50 @@ def GOOGLEDOCS_GET_DOCUMENT_BY_ID(
             "error": "",
             "successful": True
         }
-    except Exception as e:
-        return {
-            "data": {},
-            "error": f"Failed to get document: {str(e)}",
-            "successful": False
-        }
+    except _API_ERRORS as e:
+        return _failure("get document", e)
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_INSERT_PAGE_BREAK",
-    description="Insert Page Break. Inserts a page break at a given location or at the end of a segment. Args: documentId (str): Docs ID (required). insertPageBreak (object): The request object as per Docs API; provide either location {index} or endOfSegmentLocation {segmentId} (required). Returns: dict: { data: {documentId, request, replies}, error: str, successful: bool }.",
+    description="Insert Page Break. Inserts a page break at a given location or at the end of a segment. Args: documentId (str): Docs ID (required). insertPageBreak (object): The request object as per Docs API; provide either location {index} or endOfSegmentLocation {segmentId} (required); a location without an index, or with an index of 1000000000 or more, inserts at the end of the body. documentLengthHint (int): Known body end index; skips the length lookup when clamping (optional). Returns: dict: { data: {documentId, request, replies}, error: str, successful: bool }.",
 )
+@_requires("documentId", "insertPageBreak")
 def GOOGLEDOCS_INSERT_PAGE_BREAK(
     documentId: Annotated[str, "The ID of the Google Docs document to update."],
-    insertPageBreak: Annotated[Dict[str, Any], "InsertPageBreak request object with either location or endOfSegmentLocation."]
+    insertPageBreak: Annotated[Dict[str, Any], "InsertPageBreak request object with either location or endOfSegmentLocation."],
+    documentLengthHint: Annotated[Optional[int], "Known end index of the document body, e.g. from a previous call; when given, indices are clamped against it without fetching the document."] = None,
 ):
     """Insert a page break into a Google Doc.
 
     Validates the provided index against the document length when using location.index.
     """
-    err = _validate_required({"documentId": documentId, "insertPageBreak": insertPageBreak}, ["documentId", "insertPageBreak"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    req = insertPageBreak
+    location = req.get("location")
 
     try:
-        req = dict(insertPageBreak or {})
-        # Clamp index if provided
-        if "location" in req and isinstance(req["location"], dict) and "index" in req["location"]:
-            doc = docs_request("get", document_id=documentId)
-            body_content = doc.get("body", {}).get("content", [])
-            doc_length = body_content[-1].get("endIndex", 1) if body_content else 1
-            idx = int(req["location"]["index"])
-            if idx >= doc_length:
-                req["location"]["index"] = max(1, doc_length - 1)
-            if idx < 1:
-                req["location"]["index"] = 1
-
-        result = docs_request("batchUpdate", document_id=documentId, body={"requests": [{"insertPageBreak": req}]})
+        if isinstance(location, dict):
+            if int(location.get("index", END_OF_DOCUMENT_INDEX)) >= END_OF_DOCUMENT_INDEX:
+                # "End of the document" needs no clamping, so let the API resolve it
+                req = {key: value for key, value in req.items() if key != "location"}
+                req["endOfSegmentLocation"] = {key: value for key, value in location.items() if key != "index"}
+            else:
+                # Clamp index against the (cached) document length
+                req = {**req, "location": _with_clamped_index(location, _get_doc_length(documentId, documentLengthHint))}
+
+        result = _batch_update(documentId, [{"insertPageBreak": req}])
         return {
-            "data": {"documentId": documentId, "request": req, "replies": result.get("replies", [])},
+            "data": {"documentId": documentId, "request": req, "replies": result.get("replies", []), **_queued(result)},
             "error": "",
             "successful": True,
         }
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to insert page break: {str(e)}", "successful": False}
+    except _API_ERRORS as e:
+        return _failure("insert page break", e)
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_INSERT_TABLE_ACTION",
-    description="Insert Table in Google Doc. Adds a table at a specific index or end of a segment (body/header/footer). Args: documentId (str): Docs ID (required). rows (int): Number of rows (required). columns (int): Number of columns (required). index (int): Text index to insert at (optional). insertAtEndOfSegment (bool): If true, ignore index and insert at end of segment (optional). segmentId (str): Segment to target when inserting at end (optional). tabId (str): Ignored placeholder (optional). Returns: dict: { data: {documentId, request, replies}, error: str, successful: bool }.",
+    description="Insert Table in Google Doc. Adds a table at a specific index or end of a segment (body/header/footer). Args: documentId (str): Docs ID (required). rows (int): Number of rows (required). columns (int): Number of columns (required). index (int): Text index to insert at (optional; defaults to the end of the segment). insertAtEndOfSegment (bool): If true, ignore index and insert at end of segment (optional). segmentId (str): Segment to target when inserting at end (optional). tabId (str): Ignored placeholder (optional). documentLengthHint (int): Known body end index; clamps an explicit index against this length (optional). Returns: dict: { data: {documentId, request, replies}, error: str, successful: bool }.",
 )
+@_requires("documentId", "rows", "columns")
 def GOOGLEDOCS_INSERT_TABLE_ACTION(
     documentId: Annotated[str, "The ID of the Google Docs document to update."],
     rows: Annotated[int, "Number of rows to create."],
@@ -1078,99 +1567,65 @@ def GOOGLEDOCS_INSERT_TABLE_ACTION(
     insertAtEndOfSegment: Annotated[Optional[bool], "If true, insert at end of segment (body/header/footer)."] = None,
     segmentId: Annotated[Optional[str], "Segment ID when targeting headers/footers."] = None,
     tabId: Annotated[Optional[str], "Unused placeholder to match client signature."] = None,
+    documentLengthHint: Annotated[Optional[int], "Known end index of the document body, e.g. from a previous call; when given, an explicit index is clamped against it."] = None,
 ):
     """Insert a table into a Google Doc at a location or end-of-segment."""
-    err = _validate_required({"documentId": documentId, "rows": rows, "columns": columns}, ["documentId", "rows", "columns"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    insert_req: Dict[str, Any] = {"rows": int(rows), "columns": int(columns)}
+    if insertAtEndOfSegment or index is None:
+        # With no index, the end of the segment is the same place the old
+        # doc_length - 1 clamp pointed at, and needs no document fetch
+        eos: Dict[str, Any] = {}
+        if segmentId:
+            eos["segmentId"] = segmentId
+        insert_req["endOfSegmentLocation"] = eos
+    else:
+        insert_req["location"] = {"index": max(1, int(index))}
+        if documentLengthHint:
+            insert_req["location"] = _with_clamped_index(insert_req["location"], documentLengthHint)
 
     try:
-        insert_req: Dict[str, Any] = {"rows": int(rows), "columns": int(columns)}
-        if insertAtEndOfSegment:
-            eos: Dict[str, Any] = {}
-            if segmentId:
-                eos["segmentId"] = segmentId
-            insert_req["endOfSegmentLocation"] = eos
-        else:
-            # Use provided index or clamp to end-1
-            target_index = int(index) if index is not None else None
-            if target_index is None:
-                doc = docs_request("get", document_id=documentId)
-                content = doc.get("body", {}).get("content", [])
-                doc_length = content[-1].get("endIndex", 1) if content else 1
-                target_index = max(1, doc_length - 1)
-            insert_req["location"] = {"index": max(1, int(target_index))}
-
-        result = docs_request("batchUpdate", document_id=documentId, body={"requests": [{"insertTable": insert_req}]})
+        result = _batch_update(documentId, [{"insertTable": insert_req}])
         return {
-            "data": {"documentId": documentId, "request": insert_req, "replies": result.get("replies", [])},
+            "data": {"documentId": documentId, "request": insert_req, "replies": result.get("replies", []), **_queued(result)},
             "error": "",
             "successful": True,
         }
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to insert table: {str(e)}", "successful": False}
+    except _API_ERRORS as e:
+        return _failure("insert table", e)
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_INSERT_TABLE_COLUMN",
     description="Insert Table Column. Adds a column to an existing table using raw Docs API requests. Args: document_id (str): Docs ID (required). requests (array): Array of Docs API request objects (required), typically with insertTableColumn entries (e.g., {insertTableColumn:{tableCellLocation:{tableStartLocation:{index},rowIndex,columnIndex}, insertRight:true}}). Returns: dict: { data: {documentId, replies}, error: str, successful: bool }.",
 )
+@_requires("document_id")
 def GOOGLEDOCS_INSERT_TABLE_COLUMN(
     document_id: Annotated[str, "The ID of the Google Docs document to update."],
     requests: Annotated[List[Dict[str, Any]], "Docs API batchUpdate requests array containing insertTableColumn operations."]
 ):
     """Insert a table column by passing through Docs API batchUpdate requests."""
-    err = _validate_required({"document_id": document_id, "requests": requests}, ["document_id", "requests"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
-    try:
-        body = {"requests": list(requests)}
-        result = docs_request("batchUpdate", document_id=document_id, body=body)
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to insert table column: {str(e)}", "successful": False}
+    return _apply_requests(document_id, requests, "insert table column")
 
 # -------------------- EXTRA SHEETS/DOCS TOOLS --------------------
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_LIST_SPREADSHEET_CHARTS_ACTION",
     description="List Charts from Spreadsheet. Retrieves chart ids and metadata from a Google Sheets spreadsheet for embedding into Google Docs. Args: spreadsheet_id (str): Sheets ID (required). fields_mask (str): Optional fields mask; defaults to sheets(properties(sheetId,title),charts(chartId,spec(title,altText))). Returns: dict: { data: {spreadsheetId,sheetsWithCharts}, error: str, successful: bool }.",
 )
+@_requires("spreadsheet_id")
 def GOOGLEDOCS_LIST_SPREADSHEET_CHARTS_ACTION(
     spreadsheet_id: Annotated[str, "The Google Sheets spreadsheet ID."],
     fields_mask: Annotated[Optional[str], "Optional fields mask for spreadsheets.get."] = None,
 ):
     """List charts in a spreadsheet with optional fields mask."""
-    err = _validate_required({"spreadsheet_id": spreadsheet_id}, ["spreadsheet_id"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    fields = fields_mask or 'sheets(properties(sheetId,title),charts(chartId,spec(title,altText)))'
+    # Always include spreadsheetId for reference
+    if 'spreadsheetId' not in fields:
+        fields = f'spreadsheetId,{fields}'
 
     try:
-        from googleapiclient.discovery import build as build_sheets
-        creds = get_credentials()
-        sheets_service = build_sheets('sheets', 'v4', credentials=creds)
-
-        fields = fields_mask or 'sheets(properties(sheetId,title),charts(chartId,spec(title,altText)))'
-        # Always include spreadsheetId for reference
-        if 'spreadsheetId' not in fields:
-            fields = f'spreadsheetId,{fields}'
-
-        resp = sheets_service.spreadsheets().get(
-            spreadsheetId=spreadsheet_id,
-            includeGridData=False,
-            fields=fields
-        ).execute()
-
-        charts_summary: List[Dict[str, Any]] = []
-        for sh in resp.get('sheets', []):
-            props = sh.get('properties', {})
-            title = props.get('title')
-            charts = sh.get('charts', []) or []
-            if charts:
-                charts_summary.append({
-                    'sheetTitle': title,
-                    'charts': charts
-                })
+        resp = _fetch_sheet_meta(spreadsheet_id, fields)
+
+        charts_summary = list(_iter_sheets_with_charts(resp))
 
         return {
             'data': {
@@ -1180,14 +1635,15 @@ def GOOGLEDOCS_LIST_SPREADSHEET_CHARTS_ACTION(
             'error': '',
             'successful': True
         }
-    except Exception as e:
-        return {'data': {}, 'error': f'Failed to list charts: {str(e)}', 'successful': False}
+    except _API_ERRORS as e:
+        return _failure("list charts", e)
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_REPLACE_ALL_TEXT",
     description="Replace All Text in Document. Replaces all occurrences of a string with another across the document. Args: document_id (str): Docs ID (required). find_text (str): Text to find (required). replace_text (str): Replacement text (required). match_case (bool): Case sensitive match (required). search_by_regex (bool): If true, attempts regex (Docs replaceAllText does not support full regex; best-effort). tab_ids (array): Ignored/unused placeholder. Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "find_text", "replace_text", "match_case")
 def GOOGLEDOCS_REPLACE_ALL_TEXT(
     document_id: Annotated[str, "The Google Docs document ID."],
     find_text: Annotated[str, "Text to find."],
@@ -1197,48 +1653,71 @@ def GOOGLEDOCS_REPLACE_ALL_TEXT(
     tab_ids: Annotated[Optional[List[str]], "Unused placeholder for compatibility."] = None,
 ):
     """Replace all matching text throughout the document."""
-    err = _validate_required({"document_id": document_id, "find_text": find_text, "replace_text": replace_text, "match_case": match_case}, ["document_id", "find_text", "replace_text", "match_case"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    req = {
+        'replaceAllText': {
+            'containsText': {
+                'text': find_text,
+                'matchCase': bool(match_case)
+            },
+            'replaceText': replace_text
+        }
+    }
 
     try:
-        req = {
-            'replaceAllText': {
-                'containsText': {
-                    'text': find_text,
-                    'matchCase': bool(match_case)
-                },
-                'replaceText': replace_text
-            }
-        }
-        result = docs_request('batchUpdate', document_id=document_id, body={'requests': [req]})
-        return {"data": {"documentId": document_id, "replies": result.get('replies', [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to replace text: {str(e)}", "successful": False}
+        result = _batch_update(document_id, [req])
+        return {"data": {"documentId": document_id, "replies": result.get("replies", []), **_queued(result)}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure("replace text", e)
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_REPLACE_IMAGE",
     description="Replace Image in Document. Replaces a specific image with a new image from a URI. Args: document_id (str): Docs ID (required). replace_image (object): Docs replaceImage request body (required) e.g., {imageObjectId, uri, imageReplaceMethod?}. Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "replace_image")
 def GOOGLEDOCS_REPLACE_IMAGE(
     document_id: Annotated[str, "The Google Docs document ID."],
     replace_image: Annotated[Dict[str, Any], "The replaceImage request object as per Docs API."]
 ):
     """Replace an existing image via Docs API replaceImage."""
-    err = _validate_required({"document_id": document_id, "replace_image": replace_image}, ["document_id", "replace_image"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    req = {"replaceImage": replace_image}
 
     try:
-        req = {"replaceImage": replace_image}
-        result = docs_request('batchUpdate', document_id=document_id, body={'requests': [req]})
-        return {"data": {"documentId": document_id, "replies": result.get('replies', [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to replace image: {str(e)}", "successful": False}
-
-
-@mcp.tool(
+        result = _batch_update(document_id, [req])
+        return {"data": {"documentId": document_id, "replies": result.get("replies", []), **_queued(result)}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure("replace image", e)
+
+
+# Search results are kept briefly so repeated searches (e.g. an agent re-running
+# the same filter) don't hit Drive again. Creating or copying a document through
+# this server clears them; changes made elsewhere show up once entries expire.
+SEARCH_TTL_SECONDS = 60.0
+SEARCH_CACHE_SIZE = 128
+_search_results: Dict[Tuple[str, str, int], Tuple[float, List[Dict[str, Any]]]] = {}
+
+@functools.lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _drive_docs_query(query: Optional[str], created_after: Optional[str], modified_after: Optional[str],
+                      include_trashed: bool, shared_with_me: bool, starred_only: bool) -> str:
+    """Build the Drive files.list query string for GOOGLEDOCS_SEARCH_DOCUMENTS."""
+    q_parts = ["mimeType='application/vnd.google-apps.document'"]
+    if query:
+        # Perform a name contains search if simple query provided
+        escaped = query.replace("'", "\\'")
+        q_parts.append(f"name contains '{escaped}'")
+    if created_after:
+        q_parts.append(f"createdTime > '{created_after}'")
+    if modified_after:
+        q_parts.append(f"modifiedTime > '{modified_after}'")
+    if shared_with_me:
+        q_parts.append('sharedWithMe')
+    if starred_only:
+        q_parts.append('starred = true')
+    if not include_trashed:
+        q_parts.append('trashed = false')
+    return ' and '.join(q_parts)
+
+@_tool(
     "GOOGLEDOCS_SEARCH_DOCUMENTS",
     description="Search Documents. Searches Google Drive for Google Docs using filters like name, date ranges, sharing, starred, and more. Args: query (str): Free-form Drive query (optional). created_after (str): RFC3339 time (optional). modified_after (str): RFC3339 time (optional). include_trashed (bool): Include trashed (optional). shared_with_me (bool): Shared-with-me only (optional). starred_only (bool): Starred only (optional). order_by (str): Drive orderBy (default 'modifiedTime desc'). max_results (int): Page size (default 10). Returns: dict: { data: {files}, error: str, successful: bool }.",
 )
@@ -1253,65 +1732,50 @@ def GOOGLEDOCS_SEARCH_DOCUMENTS(
     max_results: Annotated[Optional[int], "Max results (page size)." ] = 10,
 ):
     """Search Google Drive for Google Docs files with filters."""
-    try:
-        from googleapiclient.discovery import build as build_drive
-        drive = build_drive('drive', 'v3', credentials=get_credentials())
-
-        q_parts = ["mimeType='application/vnd.google-apps.document'"]
-        if query:
-            # Perform a name contains search if simple query provided
-            q_parts.append(f"name contains '{query.replace("'", "\\'")}'")
-        if created_after:
-            q_parts.append(f"createdTime > '{created_after}'")
-        if modified_after:
-            q_parts.append(f"modifiedTime > '{modified_after}'")
-        if shared_with_me:
-            q_parts.append('sharedWithMe')
-        if starred_only:
-            q_parts.append('starred = true')
-        if not include_trashed:
-            q_parts.append('trashed = false')
-
-        q = ' and '.join(q_parts)
-        resp = drive.files().list(q=q, orderBy=order_by or 'modifiedTime desc', pageSize=int(max_results or 10), fields='files(id,name,mimeType,owners,createdTime,modifiedTime,starred)').execute()
-        return {"data": {"files": resp.get('files', [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to search documents: {str(e)}", "successful": False}
+    q = _drive_docs_query(query, created_after, modified_after, bool(include_trashed), bool(shared_with_me), bool(starred_only))
+    order_by = order_by or 'modifiedTime desc'
+    page_size = int(max_results or 10)
+    key = (q, order_by, page_size)
+    cached = _search_results.get(key)
+    now = time.monotonic()
+    if cached and now - cached[0] < SEARCH_TTL_SECONDS:
+        return {"data": {"files": list(cached[1])}, "error": "", "successful": True}
 
-@mcp.tool(
+    try:
+        drive = get_drive_service()
+        resp = _execute(drive.files().list(q=q, orderBy=order_by, pageSize=page_size, fields='files(id,name,mimeType,owners,createdTime,modifiedTime,starred)'))
+        files = resp.get('files', [])
+        if len(_search_results) >= SEARCH_CACHE_SIZE:
+            _search_results.clear()
+        _search_results[key] = (now, files)
+        return {"data": {"files": list(files)}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure("search documents", e)
+
+@_tool(
     "GOOGLEDOCS_INSERT_INLINE_IMAGE",
-    description="Insert Inline Image. Inserts an image from a publicly accessible https URL at a given document index; optionally sets size in points. Args: documentId (str): Docs ID (required). location (dict): { index } insertion point (required). uri (str): Public image URL (required). objectSize (dict): { width:{magnitude,unit}, height:{magnitude,unit} } (optional). Returns: dict: { data: {documentId, location, uri, replies}, error: str, successful: bool }.",
+    description="Insert Inline Image. Inserts an image from a publicly accessible https URL at a given document index; optionally sets size in points. Args: documentId (str): Docs ID (required). location (dict): { index } insertion point (required). uri (str): Public image URL (required). objectSize (dict): { width:{magnitude,unit}, height:{magnitude,unit} } (optional). documentLengthHint (int): Known body end index; skips the length lookup when clamping (optional). Returns: dict: { data: {documentId, location, uri, replies}, error: str, successful: bool }.",
 )
+@_requires("documentId", "location", "uri")
 def GOOGLEDOCS_INSERT_INLINE_IMAGE(
     documentId: Annotated[str, "The ID of the Google Docs document to insert the image into."],
     location: Annotated[Dict[str, Any], "The location where the image should be inserted. Usually a { 'index': number }."],
     uri: Annotated[str, "Publicly accessible image URL to insert."],
     objectSize: Annotated[Optional[Dict[str, Any]], "Optional object size with width/height in PT, e.g. { 'height': {'magnitude': 100, 'unit': 'PT'}, 'width': {'magnitude': 100, 'unit': 'PT'} }."] = None,
+    documentLengthHint: Annotated[Optional[int], "Known end index of the document body, e.g. from a previous call; when given, indices are clamped against it without fetching the document."] = None,
 ):
     """Insert an inline image into a Google Docs document.
 
     Validates the target index against the document length and inserts the image
     using Docs batchUpdate insertInlineImage.
     """
-    err = _validate_required({"documentId": documentId, "location": location, "uri": uri}, ["documentId", "location", "uri"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    image_location = location
 
     try:
-        # Fetch document to clamp index
-        doc = docs_request("get", document_id=documentId)
-        body_content = doc.get("body", {}).get("content", [])
-        if body_content:
-            doc_length = body_content[-1].get("endIndex", 1)
-        else:
-            doc_length = 1
-
-        image_location = dict(location or {})
-        if "index" in image_location:
-            if image_location["index"] >= doc_length:
-                image_location["index"] = max(1, doc_length - 1)
-            if image_location["index"] < 1:
-                image_location["index"] = 1
+        # Clamp index against the (cached) document length; only index
+        # locations need it, so other locations skip the lookup entirely
+        if "index" in location:
+            image_location = _with_clamped_index(location, _get_doc_length(documentId, documentLengthHint))
 
         request: Dict[str, Any] = {
             "insertInlineImage": {
@@ -1322,84 +1786,71 @@ def GOOGLEDOCS_INSERT_INLINE_IMAGE(
         if objectSize:
             request["insertInlineImage"]["objectSize"] = objectSize
 
-        result = docs_request("batchUpdate", document_id=documentId, body={"requests": [request]})
+        result = _batch_update(documentId, [request])
 
         return {
             "data": {
                 "documentId": documentId,
                 "location": image_location,
                 "uri": uri,
-                "replies": result.get("replies", []),
+                "replies": result.get("replies", []), **_queued(result),
             },
             "error": "",
             "successful": True,
         }
-    except Exception as e:
-        return {
-            "data": {},
-            "error": f"Failed to insert inline image: {str(e)}",
-            "successful": False,
-        }
+    except _API_ERRORS as e:
+        return _failure("insert inline image", e)
 
 # ---------------------- Additional Update/Formatting Tools ----------------------
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_UNMERGE_TABLE_CELLS",
     description="Unmerge Table Cells. Tool to unmerge previously merged cells in a table. Use this when you need to revert merged cells in a Google document table back to their individual cell states. Args: document_id (str): Docs ID (required). tableRange (object): Docs unmergeTableCells.tableRange object (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "tableRange")
 def GOOGLEDOCS_UNMERGE_TABLE_CELLS(
     document_id: Annotated[str, "The Google Docs document ID."],
     tableRange: Annotated[Dict[str, Any], "Docs API tableRange identifying cells to unmerge (must include tableStartLocation)."],
 ):
     """Unmerge previously merged cells using Docs API unmergeTableCells."""
-    err = _validate_required({"document_id": document_id, "tableRange": tableRange}, ["document_id", "tableRange"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    req = {"unmergeTableCells": {"tableRange": tableRange}}
 
     try:
-        req = {"unmergeTableCells": {"tableRange": tableRange}}
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": [req]})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to unmerge table cells: {str(e)}", "successful": False}
+        result = _batch_update(document_id, [req])
+        return {"data": {"documentId": document_id, "replies": result.get("replies", []), **_queued(result)}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure("unmerge table cells", e)
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_UPDATE_DOCUMENT_MARKDOWN",
-    description="Update Document Markdown. Replaces the entire content of an existing Google Docs document with new markdown text; requires edit permissions for the document. Args: document_id (str): Docs ID (required). new_markdown_text (str): Markdown text to insert (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
+    description="Update Document Markdown. Replaces the entire content of an existing Google Docs document with new markdown text; requires edit permissions for the document. Fails if a batch opened with GOOGLEDOCS_OPEN_BATCH has edits queued for the document; flush it first. Args: document_id (str): Docs ID (required). new_markdown_text (str): Markdown text to insert (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "new_markdown_text")
 def GOOGLEDOCS_UPDATE_DOCUMENT_MARKDOWN(
     document_id: Annotated[str, "The Google Docs document ID."],
     new_markdown_text: Annotated[str, "Markdown text to replace the entire document body."],
 ):
     """Replace entire body content with the provided markdown text as plain text."""
-    err = _validate_required({"document_id": document_id, "new_markdown_text": new_markdown_text}, ["document_id", "new_markdown_text"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
     try:
-        doc = docs_request("get", document_id=document_id)
-        body_content = doc.get("body", {}).get("content", [])
-        doc_len = body_content[-1].get("endIndex", 1) if body_content else 1
-
-        requests = [
-            {
-                "deleteContentRange": {
-                    "range": {"startIndex": 1, "endIndex": max(1, doc_len - 1)}
-                }
-            },
-            {"insertText": {"location": {"index": 1}, "text": new_markdown_text}},
-        ]
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": requests})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to update document with markdown: {str(e)}", "successful": False}
+        # Read the length right before the delete; a cached one may predate other edits
+        doc_len = _get_doc_length(document_id, fresh=True)
 
+        requests = [{"insertText": {"location": {"index": 1}, "text": new_markdown_text}}]
+        if doc_len > 2:
+            # An empty body has nothing to delete, and the API rejects an empty range
+            requests.insert(0, {"deleteContentRange": {"range": {"startIndex": 1, "endIndex": doc_len - 1}}})
+        result = _batch_update(document_id, requests)
+        return {"data": {"documentId": document_id, "replies": result.get("replies", []), **_queued(result)}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure("update document with markdown", e)
 
-@mcp.tool(
+
+@_tool(
     "GOOGLEDOCS_UPDATE_DOCUMENT_STYLE",
     description="Update Document Style. Tool to update the overall document style, such as page size, margins, and default text direction. Use when you need to modify the global style settings of a Google document. Args: document_id (str): Docs ID (required). document_style (object): Docs DocumentStyle object (required). fields (str): Fields mask for properties to update (required). tab_id (str): Optional tabId (optional). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "document_style", "fields")
 def GOOGLEDOCS_UPDATE_DOCUMENT_STYLE(
     document_id: Annotated[str, "The Google Docs document ID."],
     document_style: Annotated[Dict[str, Any], "DocumentStyle to apply (e.g., pageSize, margins)."],
@@ -1407,252 +1858,209 @@ def GOOGLEDOCS_UPDATE_DOCUMENT_STYLE(
     tab_id: Annotated[Optional[str], "Optional tabId for multi-tab documents."] = None,
 ):
     """Update document-level style via updateDocumentStyle."""
-    err = _validate_required({"document_id": document_id, "document_style": document_style, "fields": fields}, ["document_id", "document_style", "fields"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
-    try:
-        req: Dict[str, Any] = {
-            "updateDocumentStyle": {
-                "documentStyle": document_style,
-                "fields": fields,
-            }
-        }
-        if tab_id:
-            req["updateDocumentStyle"]["tabId"] = tab_id
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": [req]})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to update document style: {str(e)}", "successful": False}
+    return _simple_request(document_id, "updateDocumentStyle", "update document style", documentStyle=document_style, fields=fields, tabId=tab_id)
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_UPDATE_EXISTING_DOCUMENT",
-    description="Update existing document. Applies programmatic edits, such as text insertion, deletion, or formatting, to a specified Google Doc using the `batchupdate` API method. Args: document_id (str): Docs ID (required). editDocs (array): Array of raw Docs API request objects (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
+    description="Update existing document. Applies programmatic edits, such as text insertion, deletion, or formatting, to a specified Google Doc using the `batchupdate` API method. Args: document_id (str): Docs ID (required). editDocs (array): Array of raw Docs API request objects (required). dedupe (bool): Send identical requests only once, keeping the first (optional, default false). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id")
 def GOOGLEDOCS_UPDATE_EXISTING_DOCUMENT(
     document_id: Annotated[str, "The Google Docs document ID."],
     editDocs: Annotated[List[Dict[str, Any]], "Array of Docs API request objects to send to batchUpdate."],
+    dedupe: Annotated[bool, "Send identical requests only once. Only safe for idempotent requests such as styling; repeated inserts or deletes are meant to run each time."] = False,
 ):
     """Pass-through for arbitrary batchUpdate requests."""
-    err = _validate_required({"document_id": document_id, "editDocs": editDocs}, ["document_id", "editDocs"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    if dedupe:
+        editDocs = _dedupe_requests(editDocs)
+    return _apply_requests(document_id, editDocs, "update existing document")
 
-    try:
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": editDocs})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to update existing document: {str(e)}", "successful": False}
 
-
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_UPDATE_TABLE_ROW_STYLE",
     description="Update Table Row Style. Tool to update the style of a table row in a Google document. Use when you need to modify the appearance of specific rows within a table, such as setting minimum row height or marking rows as headers. Args: documentId (str): Docs ID (required). updateTableRowStyle (object): Docs updateTableRowStyle request body (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("documentId", "updateTableRowStyle")
 def GOOGLEDOCS_UPDATE_TABLE_ROW_STYLE(
     documentId: Annotated[str, "The Google Docs document ID."],
     updateTableRowStyle: Annotated[Dict[str, Any], "Docs API updateTableRowStyle request object. Accepts either the modern shape {tableStartLocation,rowIndices,tableRowStyle,fields} or a legacy shape using tableRange that will be translated."],
 ):
     """Update a table row style using Docs API updateTableRowStyle."""
-    err = _validate_required({"documentId": documentId, "updateTableRowStyle": updateTableRowStyle}, ["documentId", "updateTableRowStyle"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    # Prefer passing through modern shape directly if provided
+    req_payload: Dict[str, Any] = {}
+    fields = updateTableRowStyle.get("fields", "")
+
+    # Modern shape
+    if "tableStartLocation" in updateTableRowStyle or "rowIndices" in updateTableRowStyle:
+        if "tableStartLocation" in updateTableRowStyle:
+            req_payload["tableStartLocation"] = updateTableRowStyle["tableStartLocation"]
+        if "rowIndices" in updateTableRowStyle:
+            row_indices = updateTableRowStyle["rowIndices"]
+            req_payload["rowIndices"] = row_indices if isinstance(row_indices, list) else list(row_indices)
+        # The caller's values are only serialized, never modified, so no copies
+        req_payload["tableRowStyle"] = updateTableRowStyle.get("tableRowStyle", {})
+        req_payload["fields"] = fields
+    else:
+        # Legacy shape: { tableRange, tableRowStyle, fields }
+        tableRange = updateTableRowStyle.get("tableRange")
+        tableRowStyle = updateTableRowStyle.get("tableRowStyle", {})
+
+        # If legacy provided, try to derive rowIndices from tableRange when possible
+        if tableRange and isinstance(tableRange, dict):
+            table_cell_loc = tableRange.get("tableCellLocation", {})
+            start_loc = table_cell_loc.get("tableStartLocation")
+            start_row = table_cell_loc.get("rowIndex")
+            row_span = tableRange.get("rowSpan")
+            if start_loc is not None and start_row is not None and row_span:
+                req_payload["tableStartLocation"] = start_loc
+                req_payload["rowIndices"] = list(range(int(start_row), int(start_row) + int(row_span)))
+            # If we cannot derive, fall back to API expecting tableRowStyle only (may error)
+        req_payload["tableRowStyle"] = tableRowStyle
+        req_payload["fields"] = fields
+
+    req = {"updateTableRowStyle": req_payload}
 
     try:
-        # Prefer passing through modern shape directly if provided
-        req_payload: Dict[str, Any] = {}
-        fields = updateTableRowStyle.get("fields", "")
-
-        # Modern shape
-        if "tableStartLocation" in updateTableRowStyle or "rowIndices" in updateTableRowStyle:
-            if "tableStartLocation" in updateTableRowStyle:
-                req_payload["tableStartLocation"] = updateTableRowStyle["tableStartLocation"]
-            if "rowIndices" in updateTableRowStyle:
-                req_payload["rowIndices"] = list(updateTableRowStyle.get("rowIndices", []))
-            req_payload["tableRowStyle"] = dict(updateTableRowStyle.get("tableRowStyle", {}))
-            req_payload["fields"] = fields
-        else:
-            # Legacy shape: { tableRange, tableRowStyle, fields }
-            tableRange = updateTableRowStyle.get("tableRange")
-            tableRowStyle = updateTableRowStyle.get("tableRowStyle", {})
-
-            # If legacy provided, try to derive rowIndices from tableRange when possible
-            if tableRange and isinstance(tableRange, dict):
-                table_cell_loc = tableRange.get("tableCellLocation", {})
-                start_loc = table_cell_loc.get("tableStartLocation")
-                start_row = table_cell_loc.get("rowIndex")
-                row_span = tableRange.get("rowSpan")
-                if start_loc is not None and start_row is not None and row_span:
-                    req_payload["tableStartLocation"] = start_loc
-                    req_payload["rowIndices"] = list(range(int(start_row), int(start_row) + int(row_span)))
-                # If we cannot derive, fall back to API expecting tableRowStyle only (may error)
-            req_payload["tableRowStyle"] = dict(tableRowStyle)
-            req_payload["fields"] = fields
-
-        req = {"updateTableRowStyle": req_payload}
-        result = docs_request("batchUpdate", document_id=documentId, body={"requests": [req]})
-        return {"data": {"documentId": documentId, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to update table row style: {str(e)}", "successful": False}
+        result = _batch_update(documentId, [req])
+        return {"data": {"documentId": documentId, "replies": result.get("replies", []), **_queued(result)}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure("update table row style", e)
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_INSERT_TEXT_ACTION",
     description="Insert Text into Document. Tool to insert a string of text at a specified location within a Google document. Use when you need to add new text content to an existing document. Args: document_id (str): Docs ID (required). insertion_index (int): Index where to insert text (required). text_to_insert (str): Text to insert (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "insertion_index", "text_to_insert")
 def GOOGLEDOCS_INSERT_TEXT_ACTION(
     document_id: Annotated[str, "The Google Docs document ID."],
     insertion_index: Annotated[int, "The index where to insert the text (0-based)."],
     text_to_insert: Annotated[str, "The text to insert into the document."],
 ):
     """Insert text at a specified location in a Google Docs document."""
-    err = _validate_required({"document_id": document_id, "insertion_index": insertion_index, "text_to_insert": text_to_insert}, ["document_id", "insertion_index", "text_to_insert"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
     try:
-        # Get document length to validate index
-        doc = docs_request("get", document_id=document_id)
-        body_content = doc.get("body", {}).get("content", [])
-        doc_length = body_content[-1].get("endIndex", 1) if body_content else 1
-        
-        # Clamp index to valid range
-        clamped_index = max(1, min(insertion_index, doc_length - 1))
-        
+        if insertion_index <= 1:
+            # The start of the body is valid in every document, so there's nothing to look up
+            clamped_index = 1
+        else:
+            # Clamp index to valid range, using the (cached) document length
+            clamped_index = max(1, min(insertion_index, _get_doc_length(document_id) - 1))
+
         req = {
             "insertText": {
                 "location": {"index": clamped_index},
                 "text": text_to_insert
             }
         }
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": [req]})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to insert text: {str(e)}", "successful": False}
+        result = _batch_update(document_id, [req])
+        return {"data": {"documentId": document_id, "replies": result.get("replies", []), **_queued(result)}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure("insert text", e)
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_DELETE_CONTENT_RANGE",
     description="Delete Content Range in Document. Tool to delete a range of content from a Google document. Use when you need to remove a specific portion of text or other structural elements within a document. Args: document_id (str): Docs ID (required). range (object): Range object with startIndex and endIndex (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "range")
 def GOOGLEDOCS_DELETE_CONTENT_RANGE(
     document_id: Annotated[str, "The Google Docs document ID."],
     range: Annotated[Dict[str, Any], "Range object with startIndex and endIndex to delete."],
 ):
     """Delete a range of content from a Google Docs document."""
-    err = _validate_required({"document_id": document_id, "range": range}, ["document_id", "range"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
-    try:
-        req = {"deleteContentRange": {"range": range}}
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": [req]})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to delete content range: {str(e)}", "successful": False}
+    return _simple_request(document_id, "deleteContentRange", "delete content range", range=range)
 
 
-@mcp.tool(
+@_tool(
+    "GOOGLEDOCS_DELETE_MANY_RANGES",
+    description="Delete Many Ranges. Deletes several ranges of content in one atomic batchUpdate. Ranges are deleted from the highest startIndex down, so each range can be given in terms of the document as it is now. Ranges in the same segment and tab must not overlap. Args: document_id (str): Docs ID (required). ranges (list[object]): Non-overlapping range objects with startIndex, endIndex and optional segmentId/tabId (required). Returns: dict: { data: {documentId, ranges, replies}, error: str, successful: bool } where ranges are in the order they were deleted, aligned with replies.",
+)
+@_requires("document_id", "ranges")
+def GOOGLEDOCS_DELETE_MANY_RANGES(
+    document_id: Annotated[str, "The Google Docs document ID."],
+    ranges: Annotated[List[Dict[str, Any]], "Range objects with startIndex and endIndex to delete."],
+):
+    """Delete several ranges of content from a Google Docs document in one request."""
+    # Overlapping ranges would make a later delete cover text shifted in by an earlier one
+    last_end: Dict[Tuple[Any, Any], Any] = {}
+    for r in sorted(ranges, key=lambda r: r.get("startIndex", 0)):
+        key = (r.get("segmentId"), r.get("tabId"))
+        if key in last_end and r.get("startIndex", 0) < last_end[key]:
+            return _failure("delete ranges", f"ranges overlap at index {r.get('startIndex', 0)}")
+        last_end[key] = max(last_end.get(key, 0), r.get("endIndex", 0))
+
+    # Deleting back to front keeps the indices of the remaining ranges valid
+    ordered = sorted(ranges, key=lambda r: r.get("startIndex", 0), reverse=True)
+    requests = [{"deleteContentRange": {"range": r}} for r in ordered]
+
+    result = _apply_requests(document_id, requests, "delete ranges")
+    if result["successful"]:
+        result["data"]["ranges"] = ordered
+    return result
+
+
+@_tool(
     "GOOGLEDOCS_DELETE_FOOTER",
     description="Delete Footer. Tool to delete a footer from a Google document. Use when you need to remove a footer from a specific section or the default footer. Args: document_id (str): Docs ID (required). footer_id (str): Footer ID to delete (required). tab_id (str): Optional tab ID (optional). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "footer_id")
 def GOOGLEDOCS_DELETE_FOOTER(
     document_id: Annotated[str, "The Google Docs document ID."],
     footer_id: Annotated[str, "The footer ID to delete."],
     tab_id: Annotated[Optional[str], "Optional tab ID for multi-tab documents."] = None,
 ):
     """Delete a footer from a Google Docs document."""
-    err = _validate_required({"document_id": document_id, "footer_id": footer_id}, ["document_id", "footer_id"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    return _simple_request(document_id, "deleteFooter", "delete footer", footerId=footer_id, tabId=tab_id)
 
-    try:
-        req_body = {"deleteFooter": {"footerId": footer_id}}
-        if tab_id:
-            req_body["deleteFooter"]["tabId"] = tab_id
-        
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": [req_body]})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to delete footer: {str(e)}", "successful": False}
 
-
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_DELETE_HEADER",
     description="Delete Header. Deletes the header from the specified section or the default header if no section is specified. Use this tool to remove a header from a Google document. Args: document_id (str): Docs ID (required). header_id (str): Header ID to delete (required). tab_id (str): Optional tab ID (optional). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "header_id")
 def GOOGLEDOCS_DELETE_HEADER(
     document_id: Annotated[str, "The Google Docs document ID."],
     header_id: Annotated[str, "The header ID to delete."],
     tab_id: Annotated[Optional[str], "Optional tab ID for multi-tab documents."] = None,
 ):
     """Delete a header from a Google Docs document."""
-    err = _validate_required({"document_id": document_id, "header_id": header_id}, ["document_id", "header_id"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    return _simple_request(document_id, "deleteHeader", "delete header", headerId=header_id, tabId=tab_id)
 
-    try:
-        req_body = {"deleteHeader": {"headerId": header_id}}
-        if tab_id:
-            req_body["deleteHeader"]["tabId"] = tab_id
-        
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": [req_body]})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to delete header: {str(e)}", "successful": False}
 
-
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_DELETE_NAMED_RANGE",
     description="Delete Named Range. Tool to delete a named range from a Google document. Use when you need to remove a previously defined named range by its id or name. Args: document_id (str): Docs ID (required). deleteNamedRange (object): Delete named range request object (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "deleteNamedRange")
 def GOOGLEDOCS_DELETE_NAMED_RANGE(
     document_id: Annotated[str, "The Google Docs document ID."],
     deleteNamedRange: Annotated[Dict[str, Any], "Delete named range request object with namedRangeId or name."],
 ):
     """Delete a named range from a Google Docs document."""
-    err = _validate_required({"document_id": document_id, "deleteNamedRange": deleteNamedRange}, ["document_id", "deleteNamedRange"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
-    try:
-        req = {"deleteNamedRange": deleteNamedRange}
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": [req]})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to delete named range: {str(e)}", "successful": False}
+    return _apply_requests(document_id, [{"deleteNamedRange": deleteNamedRange}], "delete named range")
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_DELETE_PARAGRAPH_BULLETS",
     description="Delete Paragraph Bullets. Tool to remove bullets from paragraphs within a specified range in a Google document. Use when you need to clear bullet formatting from a section of a document. Args: document_id (str): Docs ID (required). range (object): Range object with startIndex and endIndex (required). tab_id (str): Optional tab ID (optional). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "range")
 def GOOGLEDOCS_DELETE_PARAGRAPH_BULLETS(
     document_id: Annotated[str, "The Google Docs document ID."],
     range: Annotated[Dict[str, Any], "Range object with startIndex and endIndex to remove bullets from."],
     tab_id: Annotated[Optional[str], "Optional tab ID for multi-tab documents."] = None,
 ):
     """Delete paragraph bullets from a specified range in a Google Docs document."""
-    err = _validate_required({"document_id": document_id, "range": range}, ["document_id", "range"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
-    try:
-        req_body = {"deleteParagraphBullets": {"range": range}}
-        if tab_id:
-            req_body["deleteParagraphBullets"]["tabId"] = tab_id
-        
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": [req_body]})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to delete paragraph bullets: {str(e)}", "successful": False}
+    # The tab is part of the Range; the request itself has no tabId field
+    return _simple_request(document_id, "deleteParagraphBullets", "delete paragraph bullets", range={**range, "tabId": tab_id} if tab_id else range)
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_DELETE_TABLE",
     description="Delete Table. Tool to delete an entire table from a Google document. Use when you have the document id and the specific start and end index of the table element to be removed. The table's range can be found by inspecting the document's content structure. Args: document_id (str): Docs ID (required). table_start_index (int): Start index of table (required). table_end_index (int): End index of table (required). segment_id (str): Optional segment ID (optional). tab_id (str): Optional tab ID (optional). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id", "table_start_index", "table_end_index")
 def GOOGLEDOCS_DELETE_TABLE(
     document_id: Annotated[str, "The Google Docs document ID."],
     table_start_index: Annotated[int, "The start index of the table to delete."],
@@ -1661,70 +2069,130 @@ def GOOGLEDOCS_DELETE_TABLE(
     tab_id: Annotated[Optional[str], "Optional tab ID for multi-tab documents."] = None,
 ):
     """Delete an entire table from a Google Docs document."""
-    err = _validate_required({"document_id": document_id, "table_start_index": table_start_index, "table_end_index": table_end_index}, ["document_id", "table_start_index", "table_end_index"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
-
-    try:
-        # Use deleteContentRange to delete the entire table
-        req_body = {
-            "deleteContentRange": {
-                "range": {
-                    "startIndex": table_start_index,
-                    "endIndex": table_end_index
-                }
-            }
-        }
-        if segment_id:
-            req_body["deleteContentRange"]["range"]["segmentId"] = segment_id
-        if tab_id:
-            req_body["deleteContentRange"]["tabId"] = tab_id
-        
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": [req_body]})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to delete table: {str(e)}", "successful": False}
+    # Use deleteContentRange to delete the entire table
+    table_range = _without_blanks({"startIndex": table_start_index, "endIndex": table_end_index, "segmentId": segment_id, "tabId": tab_id})
+    return _simple_request(document_id, "deleteContentRange", "delete table", range=table_range)
 
 
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_DELETE_TABLE_COLUMN",
     description="Delete Table Column. Tool to delete a column from a table in a Google document. Use this tool when you need to remove a specific column from an existing table within a document. Args: document_id (str): Docs ID (required). requests (array): Array of deleteTableColumn request objects (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("document_id")
 def GOOGLEDOCS_DELETE_TABLE_COLUMN(
     document_id: Annotated[str, "The Google Docs document ID."],
     requests: Annotated[List[Dict[str, Any]], "Array of deleteTableColumn request objects."],
 ):
     """Delete columns from a table in a Google Docs document."""
-    err = _validate_required({"document_id": document_id, "requests": requests}, ["document_id", "requests"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    return _apply_requests(document_id, requests, "delete table column")
 
-    try:
-        result = docs_request("batchUpdate", document_id=document_id, body={"requests": requests})
-        return {"data": {"documentId": document_id, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to delete table column: {str(e)}", "successful": False}
 
-
-@mcp.tool(
+@_tool(
     "GOOGLEDOCS_DELETE_TABLE_ROW",
     description="Delete Table Row. Tool to delete a row from a table in a Google document. Use when you need to remove a specific row from an existing table. Args: documentId (str): Docs ID (required). tableCellLocation (object): Table cell location object (required). Returns: dict: { data: {documentId,replies}, error: str, successful: bool }.",
 )
+@_requires("documentId", "tableCellLocation")
 def GOOGLEDOCS_DELETE_TABLE_ROW(
     documentId: Annotated[str, "The Google Docs document ID."],
     tableCellLocation: Annotated[Dict[str, Any], "Table cell location object specifying which row to delete."],
 ):
     """Delete a row from a table in a Google Docs document."""
-    err = _validate_required({"documentId": documentId, "tableCellLocation": tableCellLocation}, ["documentId", "tableCellLocation"])
-    if err:
-        return {"data": {}, "error": str(err), "successful": False}
+    return _simple_request(documentId, "deleteTableRow", "delete table row", tableCellLocation=tableCellLocation)
+
+
+@_tool(
+    "GOOGLEDOCS_DELETE_TABLE_ROWS",
+    description="Delete Table Rows. Deletes several table rows in one atomic batchUpdate. Rows are deleted from the last table and highest rowIndex down, so every location can be given in terms of the document as it is now. Args: documentId (str): Docs ID (required). tableCellLocations (list[object]): Table cell locations ({tableStartLocation, rowIndex, columnIndex}), one per row to delete; further cells of a row already listed are ignored (required). Returns: dict: { data: {documentId, tableCellLocations, replies}, error: str, successful: bool } where tableCellLocations are in the order they were deleted, aligned with replies.",
+)
+@_requires("documentId", "tableCellLocations")
+def GOOGLEDOCS_DELETE_TABLE_ROWS(
+    documentId: Annotated[str, "The Google Docs document ID."],
+    tableCellLocations: Annotated[List[Dict[str, Any]], "Table cell locations, one per row to delete."],
+):
+    """Delete several rows from tables in a Google Docs document in one request."""
+    # One location per row: after a row is deleted the next one moves up into
+    # its rowIndex, so a second cell of the same row would delete that one too
+    rows = {}
+    for loc in tableCellLocations:
+        rows.setdefault((loc.get("tableStartLocation", {}).get("index", 0), loc.get("rowIndex", 0)), loc)
+    # Back to front: later tables first (deleting rows shifts everything after
+    # the table), and within a table the highest row first
+    ordered = sorted(
+        rows.values(),
+        key=lambda loc: (loc.get("tableStartLocation", {}).get("index", 0), loc.get("rowIndex", 0)),
+        reverse=True,
+    )
+    requests = [{"deleteTableRow": {"tableCellLocation": loc}} for loc in ordered]
+
+    result = _apply_requests(documentId, requests, "delete table rows")
+    if result["successful"]:
+        result["data"]["tableCellLocations"] = ordered
+    return result
+
 
+# -------------------- BATCHING TOOLS --------------------
+
+@_tool(
+    "GOOGLEDOCS_OPEN_BATCH",
+    description="Open Batch. Starts queueing edits to a document: until GOOGLEDOCS_FLUSH_BATCH is called for it, the other editing tools queue their requests instead of sending them (returning empty replies and data.queued, the number of requests waiting), so many edits go out in as few batchUpdate calls as possible. Index clamping while the batch is open uses the document length from before the batch, and GOOGLEDOCS_UPDATE_DOCUMENT_MARKDOWN refuses to run while edits are queued, since it could not delete them. A batch not flushed within 5 minutes is treated as abandoned: the next edit to the document sends its queued requests first. Args: document_id (str): Docs ID (required). Returns: dict: { data: {documentId}, error: str, successful: bool }.",
+)
+@_requires("document_id")
+def GOOGLEDOCS_OPEN_BATCH(
+    document_id: Annotated[str, "The Google Docs document ID to queue edits for."],
+):
+    """Open a request batch for a document; edits are queued until flushed."""
     try:
-        req = {"deleteTableRow": {"tableCellLocation": tableCellLocation}}
-        result = docs_request("batchUpdate", document_id=documentId, body={"requests": [req]})
-        return {"data": {"documentId": documentId, "replies": result.get("replies", [])}, "error": "", "successful": True}
-    except Exception as e:
-        return {"data": {}, "error": f"Failed to delete table row: {str(e)}", "successful": False}
+        _open_batch(document_id)
+        return {"data": {"documentId": document_id}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure("open batch", e)
+
+
+@_tool(
+    "GOOGLEDOCS_FLUSH_BATCH",
+    description="Flush Batch. Sends every edit queued since GOOGLEDOCS_OPEN_BATCH for the document, in order, using one batchUpdate per 500 requests, and closes the batch. Also sends edits held back by GOOGLEDOCS_COALESCE_MS coalescing right away. Args: document_id (str): Docs ID (required). Returns: dict: { data: {documentId, requestCount, replies}, error: str, successful: bool }.",
+)
+@_requires("document_id")
+def GOOGLEDOCS_FLUSH_BATCH(
+    document_id: Annotated[str, "The Google Docs document ID whose queued edits should be sent."],
+):
+    """Send the queued edits of a document's open batch and close it."""
+    try:
+        result = _flush_batch(document_id)
+        replies = result.get("replies", [])
+        return {"data": {"documentId": document_id, "requestCount": len(replies), "replies": replies}, "error": "", "successful": True}
+    except _API_ERRORS as e:
+        return _failure("flush batch", e)
+
+
+async def _apply_to_document(document_id: str, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply requests to one document, reporting failure instead of raising.
+
+    Each document takes one of the _tool_slots that every tool call shares,
+    so a bulk call can't push past MAX_CONCURRENT_TOOL_CALLS API calls.
+    """
+    async with _tool_slots:
+        try:
+            result = await asyncio.to_thread(_batch_update, document_id, requests)
+            return {"documentId": document_id, "replies": result.get("replies", []), **_queued(result), "error": ""}
+        except _API_ERRORS as e:
+            return {"documentId": document_id, "replies": [], "error": str(e)}
+
+@mcp.tool(
+    "GOOGLEDOCS_BULK_APPLY",
+    description="Bulk Apply. Applies the same list of batchUpdate requests to several documents concurrently, so editing N documents takes roughly one round-trip instead of N. Each document succeeds or fails on its own; documents with an open batch have the requests queued. Args: document_ids (list[str]): Docs IDs (required). editDocs (list[dict]): Docs API batchUpdate requests (required). Returns: dict: { data: {results: [{documentId, replies, error}]}, error: str, successful: bool }.",
+)
+@_requires("document_ids", "editDocs")
+async def GOOGLEDOCS_BULK_APPLY(
+    document_ids: Annotated[List[str], "The Google Docs document IDs to edit."],
+    editDocs: Annotated[List[Dict[str, Any]], "Docs API batchUpdate requests applied to every document, in order."],
+):
+    """Apply the same edits to many documents concurrently."""
+    results = await asyncio.gather(*(_apply_to_document(d, editDocs) for d in document_ids))
+    failed = sum(1 for r in results if r["error"])
+    if failed:
+        return {"data": {"results": results}, "error": f"Failed to apply edits to {failed} of {len(results)} documents", "successful": False}
+    return {"data": {"results": results}, "error": "", "successful": True}
 
 
 # -------------------- MAIN --------------------